@@ -25,6 +25,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -39,6 +40,8 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'imputation.middleware.MetricsMiddleware',
+    'imputation.middleware.QueryProfilingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -159,6 +162,73 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Cache (shared between web and celery processes for locks and snapshots)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': config('CACHE_REDIS_URL', default=CELERY_BROKER_URL),
+        'KEY_PREFIX': 'federated_imputation',
+    }
+}
+
+# Reference panel sync runs (one task per service)
+PANEL_SYNC_SERVICE_TIME_LIMIT_SECONDS = config('PANEL_SYNC_SERVICE_TIME_LIMIT_SECONDS', default=300, cast=int)
+PANEL_SYNC_PROGRESS_TTL_SECONDS = 24 * 60 * 60
+
+# Rendered service/panel catalog responses; invalidated on any catalog change
+CATALOG_CACHE_TTL_SECONDS = config('CATALOG_CACHE_TTL_SECONDS', default=60 * 60, cast=int)
+
+# Job status polling
+JOB_STATUS_POLL_INTERVAL_SECONDS = config('JOB_STATUS_POLL_INTERVAL_SECONDS', default=60, cast=int)
+JOB_STATUS_POLL_BATCH_SIZE = config('JOB_STATUS_POLL_BATCH_SIZE', default=500, cast=int)
+# Run each batch's status checks concurrently with asyncio
+JOB_STATUS_POLL_ASYNC = config('JOB_STATUS_POLL_ASYNC', default=True, cast=bool)
+JOB_STATUS_POLL_CONCURRENCY = config('JOB_STATUS_POLL_CONCURRENCY', default=100, cast=int)
+
+# Status updates inlined in the job detail response
+JOB_DETAIL_STATUS_UPDATES_LIMIT = config('JOB_DETAIL_STATUS_UPDATES_LIMIT', default=50, cast=int)
+
+# Drift correction for the per-user job counters (UserJobStats)
+USER_JOB_STATS_RECONCILE_INTERVAL_SECONDS = config('USER_JOB_STATS_RECONCILE_INTERVAL_SECONDS', default=60 * 60, cast=int)
+
+# Background service health probes, recorded as ServiceHealthCheck history
+SERVICE_HEALTH_PROBE_INTERVAL_SECONDS = config('SERVICE_HEALTH_PROBE_INTERVAL_SECONDS', default=60, cast=int)
+SERVICE_HEALTH_PROBE_TIMEOUT_SECONDS = 10
+SERVICE_HEALTH_PROBE_MAX_WORKERS = config('SERVICE_HEALTH_PROBE_MAX_WORKERS', default=16, cast=int)
+SERVICE_HEALTH_CHECK_DEADLINE_SECONDS = config('SERVICE_HEALTH_CHECK_DEADLINE_SECONDS', default=30, cast=int)
+SERVICE_HEALTH_HISTORY_RETENTION_DAYS = config('SERVICE_HEALTH_HISTORY_RETENTION_DAYS', default=30, cast=int)
+
+# Job throughput rollups; each run recomputes buckets overlapping the lookback
+# window, which must exceed the interval so no bucket is missed
+JOB_METRICS_ROLLUP_INTERVAL_SECONDS = config('JOB_METRICS_ROLLUP_INTERVAL_SECONDS', default=15 * 60, cast=int)
+JOB_METRICS_ROLLUP_LOOKBACK_HOURS = config('JOB_METRICS_ROLLUP_LOOKBACK_HOURS', default=3, cast=int)
+JOB_METRICS_MAX_HOURLY_POINTS = 24 * 14
+JOB_METRICS_MAX_DAILY_POINTS = 365
+
+# Periodic tasks run by celery beat
+CELERY_BEAT_SCHEDULE = {
+    'poll-active-jobs': {
+        'task': 'imputation.tasks.poll_active_jobs',
+        'schedule': JOB_STATUS_POLL_INTERVAL_SECONDS,
+        'options': {'expires': JOB_STATUS_POLL_INTERVAL_SECONDS},
+    },
+    'probe-services-health': {
+        'task': 'imputation.tasks.probe_services_health',
+        'schedule': SERVICE_HEALTH_PROBE_INTERVAL_SECONDS,
+        'options': {'expires': SERVICE_HEALTH_PROBE_INTERVAL_SECONDS},
+    },
+    'reconcile-user-job-stats': {
+        'task': 'imputation.tasks.reconcile_user_job_stats',
+        'schedule': USER_JOB_STATS_RECONCILE_INTERVAL_SECONDS,
+        'options': {'expires': USER_JOB_STATS_RECONCILE_INTERVAL_SECONDS},
+    },
+    'rollup-job-metrics': {
+        'task': 'imputation.tasks.rollup_job_metrics',
+        'schedule': JOB_METRICS_ROLLUP_INTERVAL_SECONDS,
+        'options': {'expires': JOB_METRICS_ROLLUP_INTERVAL_SECONDS},
+    },
+}
+
 # API Configuration
 H3AFRICA_API_URL = config('H3AFRICA_API_URL', default='https://h3africa.org/api/v1/')
 H3AFRICA_API_KEY = config('H3AFRICA_API_KEY', default='demo_key')
@@ -170,6 +240,55 @@ MICHIGAN_API_KEY = config('MICHIGAN_API_KEY', default='demo_key')
 FILE_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 100 * 1024 * 1024  # 100MB
 
+# Pooled HTTP sessions for external services (per-service overrides live in
+# ServiceConfiguration.settings: pool_connections, pool_maxsize,
+# retry_backoff_factor, connect_timeout_seconds)
+SERVICE_HTTP_POOL_CONNECTIONS = config('SERVICE_HTTP_POOL_CONNECTIONS', default=4, cast=int)
+SERVICE_HTTP_POOL_MAXSIZE = config('SERVICE_HTTP_POOL_MAXSIZE', default=10, cast=int)
+SERVICE_HTTP_RETRY_ATTEMPTS = 3
+SERVICE_HTTP_RETRY_BACKOFF = 0.5
+SERVICE_HTTP_CONNECT_TIMEOUT_SECONDS = config('SERVICE_HTTP_CONNECT_TIMEOUT_SECONDS', default=10, cast=int)
+SERVICE_HTTP_TIMEOUT_SECONDS = 60  # Read timeout when a service has no ServiceConfiguration
+# Cap on the read timeout for job status checks, so one slow service cannot stall a poll run
+SERVICE_HTTP_STATUS_READ_TIMEOUT_SECONDS = config('SERVICE_HTTP_STATUS_READ_TIMEOUT_SECONDS', default=15, cast=int)
+
+# Per-service circuit breaker (overridable in ServiceConfiguration.settings)
+SERVICE_CIRCUIT_FAILURE_THRESHOLD = config('SERVICE_CIRCUIT_FAILURE_THRESHOLD', default=5, cast=int)
+SERVICE_CIRCUIT_FAILURE_WINDOW_SECONDS = 60
+SERVICE_CIRCUIT_RECOVERY_SECONDS = config('SERVICE_CIRCUIT_RECOVERY_SECONDS', default=60, cast=int)
+
+# GA4GH service-info cache: entries older than the TTL are served stale while
+# one background task refreshes them
+SERVICE_INFO_TTL_SECONDS = config('SERVICE_INFO_TTL_SECONDS', default=60 * 60, cast=int)
+SERVICE_INFO_STALE_TTL_SECONDS = config('SERVICE_INFO_STALE_TTL_SECONDS', default=24 * 60 * 60, cast=int)
+SERVICE_INFO_REFRESH_LOCK_SECONDS = 60
+
+# Local copies of job result files
+RESULT_FILES_ROOT = config('RESULT_FILES_ROOT', default=str(MEDIA_ROOT / 'results'))
+RESULT_DOWNLOAD_MAX_WORKERS = config('RESULT_DOWNLOAD_MAX_WORKERS', default=4, cast=int)
+RESULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+# Internal nginx location mapped to RESULT_FILES_ROOT; when set, downloads
+# are handed to nginx with X-Accel-Redirect instead of streamed by Django
+RESULT_FILES_ACCEL_REDIRECT_PREFIX = config('RESULT_FILES_ACCEL_REDIRECT_PREFIX', default='')
+
+# Chunk size for resumable uploads to services that opt in with
+# ServiceConfiguration.settings['chunked_upload'] (see MichiganImputationService._upload_chunked)
+UPLOAD_CHUNK_SIZE_BYTES = config('UPLOAD_CHUNK_SIZE_BYTES', default=8 * 1024 * 1024, cast=int)  # 8MB
+
+# Prometheus metrics (set PROMETHEUS_MULTIPROC_DIR in the environment when
+# running more than one gunicorn worker; the Celery exporter requires it).
+# /metrics is closed until METRICS_AUTH_TOKEN is set.
+METRICS_AUTH_TOKEN = config('METRICS_AUTH_TOKEN', default='')
+METRICS_CELERY_QUEUES = config('METRICS_CELERY_QUEUES', default='celery').split(',')
+CELERY_METRICS_PORT = config('CELERY_METRICS_PORT', default=0, cast=int)
+
+# Per-request SQL profiling (off by default; see QueryProfilingMiddleware)
+SQL_PROFILING_ENABLED = config('SQL_PROFILING_ENABLED', default=False, cast=bool)
+SQL_PROFILING_QUERY_BUDGET = config('SQL_PROFILING_QUERY_BUDGET', default=50, cast=int)
+SQL_PROFILING_TIME_BUDGET_MS = config('SQL_PROFILING_TIME_BUDGET_MS', default=500, cast=int)
+SQL_PROFILING_REPEAT_THRESHOLD = config('SQL_PROFILING_REPEAT_THRESHOLD', default=5, cast=int)
+SQL_PROFILING_HEADER_SAMPLE_RATE = config('SQL_PROFILING_HEADER_SAMPLE_RATE', default=0.1, cast=float)
+
 # Security settings
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -231,6 +350,11 @@ LOGGING = {
             'handlers': ['console', 'file'],
             'propagate': False,
         },
+        'httpx': {
+            'level': 'WARNING',  # httpx logs every request at INFO
+            'handlers': ['console'],
+            'propagate': False,
+        },
     },
     'root': {
         'level': 'INFO',
@@ -8,11 +8,14 @@ from django.conf.urls.static import static
 
 # Import the separate URL patterns from imputation app
 from imputation.urls import api_patterns, frontend_patterns
+from imputation.views import metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     # API routes under /api/ prefix
     path('api/', include((api_patterns, 'imputation'), namespace='api')),
+    # Prometheus metrics
+    path('metrics', metrics, name='metrics'),
     # Frontend routes at root level
     path('', include((frontend_patterns, 'imputation'), namespace='frontend')),
 ]
@@ -106,6 +106,18 @@ export interface DashboardStats {
   recent_jobs: ImputationJob[];
 }
 
+export interface PanelSyncStatus {
+  run_id: string;
+  finished: boolean;
+  counts: Record<string, number>;
+  services: {
+    service_id: number;
+    service_name?: string;
+    status: 'pending' | 'running' | 'success' | 'failed' | 'unknown';
+    error?: string;
+  }[];
+}
+
 // API Context
 interface ApiContextType {
   api: AxiosInstance;
@@ -113,7 +125,8 @@ interface ApiContextType {
   // Services
   getServices: () => Promise<ImputationService[]>;
   getService: (id: number) => Promise<ImputationService>;
-  syncReferencePanels: (serviceId: number) => Promise<{ message: string; task_id: string }>;
+  syncReferencePanels: (serviceId: number) => Promise<PanelSyncStatus>;
+  getPanelSyncStatus: (runId: string) => Promise<PanelSyncStatus>;
   
   // Reference Panels
   getReferencePanels: (serviceId?: number, population?: string, build?: string) => Promise<ReferencePanel[]>;
@@ -165,6 +178,9 @@ const createApiInstance = (): AxiosInstance => {
   return instance;
 };
 
+const PANEL_SYNC_POLL_INTERVAL_MS = 2000;
+const PANEL_SYNC_MAX_POLLS = 180;
+
 export const ApiProvider: React.FC<{ children: ReactNode }> = ({ children }) => {
   const api = createApiInstance();
 
@@ -184,8 +200,22 @@ export const ApiProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
     return response.data;
   };
 
-  const syncReferencePanels = async (serviceId: number): Promise<{ message: string; task_id: string }> => {
+  // Starts a sync run (staff only) and resolves once the run has finished
+  const syncReferencePanels = async (serviceId: number): Promise<PanelSyncStatus> => {
     const response = await api.post(`/services/${serviceId}/sync_reference_panels/`);
+    const runId: string = response.data.task_id;
+    for (let attempt = 0; attempt < PANEL_SYNC_MAX_POLLS; attempt++) {
+      const syncStatus = await getPanelSyncStatus(runId);
+      if (syncStatus.finished) {
+        return syncStatus;
+      }
+      await new Promise((resolve) => setTimeout(resolve, PANEL_SYNC_POLL_INTERVAL_MS));
+    }
+    throw new Error(`Reference panel sync ${runId} did not finish in time`);
+  };
+
+  const getPanelSyncStatus = async (runId: string): Promise<PanelSyncStatus> => {
+    const response: AxiosResponse<PanelSyncStatus> = await api.get(`/services/sync_status/${runId}/`);
     return response.data;
   };
 
@@ -249,8 +279,8 @@ export const ApiProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
   };
 
   const getJobStatusUpdates = async (id: string): Promise<JobStatusUpdate[]> => {
-    const response: AxiosResponse<JobStatusUpdate[]> = await api.get(`/jobs/${id}/status_updates/`);
-    return response.data;
+    const response: AxiosResponse<{ next: string | null; results: JobStatusUpdate[] }> = await api.get(`/jobs/${id}/status_updates/`);
+    return response.data.results;
   };
 
   const getJobFiles = async (id: string): Promise<ResultFile[]> => {
@@ -279,6 +309,7 @@ export const ApiProvider: React.FC<{ children: ReactNode }> = ({ children }) =>
     getServices,
     getService,
     syncReferencePanels,
+    getPanelSyncStatus,
     getReferencePanels,
     getServiceReferencePanels,
     getJobs,
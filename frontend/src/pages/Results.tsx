@@ -58,8 +58,8 @@ const Results: React.FC = () => {
     try {
       setLoading(true);
       const response = await api.get('/result-files/');
-      // Ensure response.data is an array
-      const filesData = Array.isArray(response.data) ? response.data : [];
+      // Handle paginated response
+      const filesData = Array.isArray(response.data.results) ? response.data.results : [];
       setFiles(filesData);
     } catch (err) {
       setError('Failed to load result files');
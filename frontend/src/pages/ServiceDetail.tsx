@@ -66,6 +66,7 @@ import {
   LocalOffer,
 } from '@mui/icons-material';
 import { useApi, ImputationService, ReferencePanel } from '../contexts/ApiContext';
+import { useAuth } from '../contexts/AuthContext';
 
 interface ServiceInfo {
   supported_wes_versions?: string[];
@@ -106,6 +107,9 @@ const ServiceDetail: React.FC = () => {
   const { id } = useParams<{ id: string }>();
   const navigate = useNavigate();
   const { getService, getServiceReferencePanels, syncReferencePanels } = useApi();
+  const { user } = useAuth();
+  // Panel sync is restricted to staff by the API
+  const canSyncPanels = Boolean(user?.is_staff);
   
   const [service, setService] = useState<ImputationService | null>(null);
   const [panels, setPanels] = useState<ReferencePanel[]>([]);
@@ -276,14 +280,16 @@ const ServiceDetail: React.FC = () => {
               {refreshing ? <CircularProgress size={24} /> : <Refresh />}
             </IconButton>
           </Tooltip>
-          <Button
-            variant="contained"
-            startIcon={syncing ? <CircularProgress size={20} /> : <Sync />}
-            onClick={handleSync}
-            disabled={syncing}
-          >
-            {syncing ? 'Syncing...' : 'Sync Panels'}
-          </Button>
+          {canSyncPanels && (
+            <Button
+              variant="contained"
+              startIcon={syncing ? <CircularProgress size={20} /> : <Sync />}
+              onClick={handleSync}
+              disabled={syncing}
+            >
+              {syncing ? 'Syncing...' : 'Sync Panels'}
+            </Button>
+          )}
         </Box>
       </Box>
 
@@ -1090,7 +1096,7 @@ const ServiceDetail: React.FC = () => {
 
               {panels.length === 0 ? (
                 <Alert severity="info">
-                  No reference panels found. Click "Sync Panels" to fetch the latest panels from this service.
+                  No reference panels found.{canSyncPanels && ' Click "Sync Panels" to fetch the latest panels from this service.'}
                 </Alert>
               ) : (
                 <List>
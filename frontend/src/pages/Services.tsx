@@ -52,10 +52,14 @@ import {
   WarningAmber,
 } from '@mui/icons-material';
 import { useApi, ImputationService, ReferencePanel } from '../contexts/ApiContext';
+import { useAuth } from '../contexts/AuthContext';
 
 const Services: React.FC = () => {
   const navigate = useNavigate();
   const { getServices, getServiceReferencePanels, syncReferencePanels } = useApi();
+  const { user } = useAuth();
+  // Panel sync is restricted to staff by the API
+  const canSyncPanels = Boolean(user?.is_staff);
   const [services, setServices] = useState<ImputationService[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
@@ -701,14 +705,16 @@ const Services: React.FC = () => {
                 >
                   View Details
                 </Button>
-                <Button 
-                  size="small" 
-                  onClick={() => handleSyncPanels(service.id)}
-                  disabled={syncing === service.id}
-                  startIcon={syncing === service.id ? <CircularProgress size={16} /> : <Sync />}
-                >
-                  {syncing === service.id ? 'Syncing...' : 'Sync'}
-                </Button>
+                {canSyncPanels && (
+                  <Button 
+                    size="small" 
+                    onClick={() => handleSyncPanels(service.id)}
+                    disabled={syncing === service.id}
+                    startIcon={syncing === service.id ? <CircularProgress size={16} /> : <Sync />}
+                  >
+                    {syncing === service.id ? 'Syncing...' : 'Sync'}
+                  </Button>
+                )}
               </CardActions>
             </Card>
           </Grid>
@@ -743,7 +749,7 @@ const Services: React.FC = () => {
 
               {referencePanels.length === 0 ? (
                 <Alert severity="info">
-                  No reference panels found. Click "Sync Panels" to fetch the latest panels from this service.
+                  No reference panels found.{canSyncPanels && ' Click "Sync Panels" to fetch the latest panels from this service.'}
                 </Alert>
               ) : (
                 <List>
@@ -781,14 +787,16 @@ const Services: React.FC = () => {
               <Button onClick={() => setDialogOpen(false)}>
                 Close
               </Button>
-              <Button 
-                onClick={() => handleSyncPanels(selectedService.id)}
-                disabled={syncing === selectedService.id}
-                startIcon={syncing === selectedService.id ? <CircularProgress size={16} /> : <Sync />}
-                variant="contained"
-              >
-                {syncing === selectedService.id ? 'Syncing...' : 'Sync Panels'}
-              </Button>
+              {canSyncPanels && (
+                <Button 
+                  onClick={() => handleSyncPanels(selectedService.id)}
+                  disabled={syncing === selectedService.id}
+                  startIcon={syncing === selectedService.id ? <CircularProgress size={16} /> : <Sync />}
+                  variant="contained"
+                >
+                  {syncing === selectedService.id ? 'Syncing...' : 'Sync Panels'}
+                </Button>
+              )}
             </DialogActions>
           </>
         )}
@@ -1,15 +1,16 @@
 """
 Django admin configuration for the imputation app.
 """
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.utils.html import format_html
 from django.urls import reverse, path
 from django.utils.safestring import mark_safe
-from django.http import HttpResponseRedirect
 from .models import (
     ImputationService, ReferencePanel, ImputationJob,
-    JobStatusUpdate, ResultFile, ServiceConfiguration, UserServiceAccess
+    JobStatusUpdate, ResultFile, ServiceConfiguration, ServiceHealthCheck,
+    UserServiceAccess, UserJobStats, JobMetricsRollup
 )
+from .panel_sync import get_panel_sync_status, start_panel_sync
 from .admin_views import (
     ServiceSetupView, ServiceDetailView, test_service_connection, 
     sync_reference_panels_view, refresh_service_info
@@ -106,10 +107,18 @@ class ImputationServiceAdmin(admin.ModelAdmin):
     actions = ['sync_panels_action']
     
     def sync_panels_action(self, request, queryset):
-        """Admin action to sync panels for selected services."""
-        for service in queryset:
-            url = reverse('admin:imputation_sync_panels', args=[service.id])
-            return HttpResponseRedirect(url)
+        """Admin action to sync panels for all selected services in parallel."""
+        run_id = start_panel_sync(queryset.values_list('id', flat=True), requested_by=request.user.username)
+        started = len(get_panel_sync_status(run_id)['service_ids'])  # Inactive services are skipped
+        status_url = reverse('api:imputationservice-sync-status', args=[run_id])
+        self.message_user(
+            request,
+            format_html(
+                'Reference panel sync started for {} services. <a href="{}">View progress</a>',
+                started, status_url
+            ),
+            messages.SUCCESS
+        )
     sync_panels_action.short_description = "Sync reference panels"
 
 
@@ -173,7 +182,7 @@ class ImputationJobAdmin(admin.ModelAdmin):
             'fields': ('status', 'progress_percentage', 'external_job_id', 'error_message')
         }),
         ('Files', {
-            'fields': ('input_file', 'input_file_size', 'result_files')
+            'fields': ('input_file', 'input_file_size', 'upload_id', 'upload_confirmed_bytes', 'remote_file_id', 'input_file_checksum', 'result_files')
         }),
         ('Execution Details', {
             'fields': ('execution_time_seconds', 'service_response'),
@@ -253,6 +262,33 @@ class ResultFileAdmin(admin.ModelAdmin):
     file_size_display.short_description = 'File Size'
 
 
+@admin.register(ServiceHealthCheck)
+class ServiceHealthCheckAdmin(admin.ModelAdmin):
+    list_display = ['service', 'is_healthy', 'status_code', 'latency_ms', 'error_class', 'checked_at']
+    list_filter = ['is_healthy', 'service', 'error_class']
+    search_fields = ['service__name', 'error_message']
+    readonly_fields = ['service', 'is_healthy', 'status_code', 'latency_ms', 'panels_count', 'error_class', 'error_message', 'checked_at']
+    date_hierarchy = 'checked_at'
+    list_select_related = ['service']
+
+
+@admin.register(UserJobStats)
+class UserJobStatsAdmin(admin.ModelAdmin):
+    list_display = ['user', 'total', 'pending', 'queued', 'running', 'completed', 'failed', 'cancelled', 'updated_at']
+    search_fields = ['user__username', 'user__email']
+    readonly_fields = ['user', 'total', 'pending', 'queued', 'running', 'completed', 'failed', 'cancelled', 'updated_at']
+    list_select_related = ['user']
+
+
+@admin.register(JobMetricsRollup)
+class JobMetricsRollupAdmin(admin.ModelAdmin):
+    list_display = ['bucket_start', 'period', 'service', 'reference_panel', 'submitted', 'completed', 'failed', 'median_execution_seconds', 'p95_execution_seconds']
+    list_filter = ['period', 'service']
+    readonly_fields = ['period', 'bucket_start', 'service', 'reference_panel', 'submitted', 'completed', 'failed', 'median_execution_seconds', 'p95_execution_seconds', 'updated_at']
+    date_hierarchy = 'bucket_start'
+    list_select_related = ['service', 'reference_panel']
+
+
 @admin.register(ServiceConfiguration)
 class ServiceConfigurationAdmin(admin.ModelAdmin):
     list_display = ['service', 'rate_limit_per_hour', 'timeout_seconds', 'retry_attempts', 'updated_at']
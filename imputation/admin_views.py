@@ -3,7 +3,7 @@ Custom admin views for imputation service management.
 """
 import json
 import requests
-from datetime import datetime, timedelta
+from datetime import timedelta
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.shortcuts import render, redirect, get_object_or_404
@@ -11,9 +11,10 @@ from django.urls import reverse
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.http import JsonResponse
-from django.utils import timezone
-from .models import ImputationService, ReferencePanel
+from .models import ImputationService
 from .forms import ServiceSetupForm
+from .services import apply_panel_sync, get_service_instance
+from . import service_info as service_info_cache
 
 
 @method_decorator(staff_member_required, name='dispatch')
@@ -299,36 +300,24 @@ def test_ga4gh_api(api_url, api_key=None):
 
 @staff_member_required
 def sync_reference_panels_view(request, service_id):
-    """Sync reference panels for a service."""
+    """Sync reference panels for a service from its live catalog.
+    
+    Fetch errors are reported and nothing is synced, so a failed fetch never
+    replaces the catalog with placeholder panels or deactivates it.
+    """
     service = get_object_or_404(ImputationService, id=service_id)
     
     try:
-        # Based on API type, sync panels differently
-        if service.api_type == 'michigan':
-            panels = sync_michigan_panels(service)
-        elif service.api_type == 'ga4gh':
-            panels = sync_ga4gh_panels(service)
-        elif service.api_type == 'dnastack':
-            panels = sync_dnastack_panels(service)
-        else:
-            messages.error(request, f'Unknown API type: {service.api_type}')
-            return redirect('admin:imputation_imputationservice_changelist')
-        
-        # Clear existing panels
-        service.reference_panels.all().delete()
-        
-        # Create new panels
-        for panel_data in panels:
-            ReferencePanel.objects.create(
-                service=service,
-                **panel_data
-            )
-        
+        panels = get_service_instance(service.id).fetch_reference_panels()
+        result = apply_panel_sync(service, panels)
         messages.success(
             request, 
-            f'Successfully synced {len(panels)} reference panels for {service.name}'
+            f"Successfully synced {len(panels)} reference panels for {service.name} "
+            f"({result['created']} added, {result['updated']} updated, {result['deactivated']} deactivated)"
         )
         
+    except ValueError as e:
+        messages.error(request, str(e))
     except Exception as e:
         messages.error(request, f'Error syncing panels: {str(e)}')
     
@@ -383,14 +372,8 @@ def sync_ga4gh_panels(service):
         if response.status_code == 200:
             data = response.json()
             
-            # Store service info in api_config
-            if not service.api_config:
-                service.api_config = {}
-            service.api_config['_service_info'] = {
-                'timestamp': datetime.now().isoformat(),
-                'data': data
-            }
-            service.save()
+            # Store service info in the service-info cache
+            service_info_cache.store_service_info(service, data)
             
             # Create H3Africa-style reference panels for GA4GH services
             panels = [
@@ -563,17 +546,14 @@ class ServiceDetailView(View):
                 context['service_info'] = service_info
                 
                 # Calculate cache age
-                if service.api_config and '_service_info' in service.api_config:
-                    cached_info = service.api_config['_service_info']
-                    if 'timestamp' in cached_info:
-                        timestamp = datetime.fromisoformat(cached_info['timestamp'])
-                        age = timezone.now() - timestamp.replace(tzinfo=timezone.utc)
-                        if age < timedelta(minutes=1):
-                            context['cache_age'] = f"{age.seconds} seconds"
-                        elif age < timedelta(hours=1):
-                            context['cache_age'] = f"{age.seconds // 60} minutes"
-                        else:
-                            context['cache_age'] = f"{age.seconds // 3600} hours"
+                age = service_info_cache.get_service_info_age(service)
+                if age is not None:
+                    if age < timedelta(minutes=1):
+                        context['cache_age'] = f"{age.seconds} seconds"
+                    elif age < timedelta(hours=1):
+                        context['cache_age'] = f"{age.seconds // 60} minutes"
+                    else:
+                        context['cache_age'] = f"{int(age.total_seconds()) // 3600} hours"
                 
                 # Calculate total jobs
                 if 'system_state_counts' in service_info:
@@ -610,10 +590,9 @@ def refresh_service_info(request, service_id):
     """Refresh service info from the API."""
     service = get_object_or_404(ImputationService, id=service_id)
     
-    # Clear cache to force refresh
-    if service.api_config and '_service_info' in service.api_config:
-        del service.api_config['_service_info']
-        service.save()
+    # Drop the cached entry and fetch a fresh copy in the background
+    service_info_cache.invalidate(service)
+    service_info_cache.schedule_refresh(service)
     
-    messages.success(request, f'Service information refreshed for {service.name}')
+    messages.success(request, f'Service information refresh scheduled for {service.name}')
     return redirect('admin:imputation_service_detail', service_id=service_id) 
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+Asyncio client layer for read-only calls to imputation services.
+
+Wraps a synchronous service integration and reuses its endpoints, response
+parsers, auth headers, deadlines and circuit breaker, so hundreds of status
+checks can run concurrently on a single event loop instead of one per Celery
+worker slot.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, List
+import httpx
+from django.conf import settings
+from .circuit_breaker import CircuitOpenError
+from .clients import status_timeout
+from .metrics import observe_service_request
+from .services import BaseImputationService
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncImputationService:
+    """Async counterpart of a BaseImputationService for status, results and panels."""
+
+    def __init__(self, sync_service: BaseImputationService, client: httpx.AsyncClient):
+        self.sync_service = sync_service
+        self.service = sync_service.service
+        self.api_url = sync_service.api_url
+        self.circuit_breaker = sync_service.circuit_breaker
+        self.client = client
+
+    async def _make_request(self, method: str, endpoint: str, outcomes: Counter = None, **kwargs) -> Any:
+        """Make an authenticated request to the service API.
+
+        The circuit breaker lives in the shared cache, so its checks are
+        blocking round trips. Batched calls pass ``outcomes`` to tally
+        successes and failures instead, and the batch consults the breaker
+        once before and once after; single calls run the checks in a thread.
+        """
+        url = f"{self.api_url.rstrip('/')}/{endpoint.lstrip('/')}"
+
+        if outcomes is None:
+            # Fail fast while the service is known to be down
+            await asyncio.to_thread(self.circuit_breaker.before_call)
+        elif outcomes['failure'] >= self.circuit_breaker.failure_threshold and not outcomes['success']:
+            # This batch alone has tripped the threshold; stop calling the service
+            raise CircuitOpenError(f"Circuit open for {self.service.name}, failing fast")
+
+        started = time.monotonic()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            observe_service_request(self.service.name, method, endpoint, time.monotonic() - started, e)
+            # Client errors mean the service is up; only 5xx count as failures
+            await self._record(outcomes, success=e.response.status_code < 500)
+            logger.error(f"API request failed for {self.service.name}: {e}")
+            raise
+        except httpx.HTTPError as e:
+            observe_service_request(self.service.name, method, endpoint, time.monotonic() - started, e)
+            await self._record(outcomes, success=False)
+            logger.error(f"API request failed for {self.service.name}: {e}")
+            raise
+
+        observe_service_request(self.service.name, method, endpoint, time.monotonic() - started)
+        await self._record(outcomes, success=True)
+        return response.json() if response.content else {}
+
+    async def _record(self, outcomes: Counter, success: bool):
+        if outcomes is not None:
+            outcomes['success' if success else 'failure'] += 1
+        elif success:
+            await asyncio.to_thread(self.circuit_breaker.record_success)
+        else:
+            await asyncio.to_thread(self.circuit_breaker.record_failure)
+
+    async def get_reference_panels(self) -> List[Dict[str, Any]]:
+        """Get available reference panels from the service."""
+        try:
+            response = await self._make_request('GET', self.sync_service.reference_panels_endpoint)
+            return self.sync_service._parse_reference_panels(response)
+        except Exception as e:
+            logger.error(f"Failed to fetch reference panels from {self.service.name}: {e}")
+            return []
+
+    async def get_job_status(self, external_job_id: str, outcomes: Counter = None) -> Dict[str, Any]:
+        """Get the status of a submitted job; transport, timeout and server errors are raised."""
+        endpoint = self.sync_service.job_status_endpoint.format(external_job_id=external_job_id)
+        response = await self._make_request('GET', endpoint, outcomes=outcomes)
+        return self.sync_service._parse_job_status(response)
+
+    async def download_results(self, external_job_id: str) -> List[Dict[str, Any]]:
+        """Get download URLs for job results."""
+        endpoint = self.sync_service.results_endpoint.format(external_job_id=external_job_id)
+        try:
+            response = await self._make_request('GET', endpoint)
+            return self.sync_service._parse_results(response)
+        except Exception as e:
+            logger.error(f"Failed to get results from {self.service.name}: {e}")
+            return []
+
+    async def get_jobs_status(self, external_job_ids: List[str], concurrency: int) -> Dict[str, Dict[str, Any]]:
+        """Check many jobs concurrently, at most ``concurrency`` in flight.
+
+        The circuit breaker is checked once before the batch and updated once
+        after it. Jobs whose check was short-circuited or failed are left out
+        of the result so callers leave them untouched.
+        """
+        try:
+            self.circuit_breaker.before_call()
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping {len(external_job_ids)} status checks: {e}")
+            return {}
+
+        semaphore = asyncio.Semaphore(concurrency)
+        outcomes = Counter()
+
+        async def check(external_job_id):
+            async with semaphore:
+                return await self.get_job_status(external_job_id, outcomes=outcomes)
+
+        results = await asyncio.gather(
+            *(check(external_job_id) for external_job_id in external_job_ids),
+            return_exceptions=True
+        )
+        self.circuit_breaker.record_outcomes(outcomes['success'], outcomes['failure'])
+
+        statuses = {}
+        for external_job_id, result in zip(external_job_ids, results):
+            if isinstance(result, CircuitOpenError):
+                continue
+            if isinstance(result, BaseException):
+                logger.error(f"Status check for {external_job_id} on {self.service.name} failed: {result}")
+                continue
+            statuses[external_job_id] = result
+        return statuses
+
+
+def _async_client(sync_service: BaseImputationService, concurrency: int) -> httpx.AsyncClient:
+    """Build an AsyncClient for status checks with the sync session's headers."""
+    connect_timeout, read_timeout = status_timeout(sync_service.service)
+    return httpx.AsyncClient(
+        headers=dict(sync_service.session.headers),
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        transport=httpx.AsyncHTTPTransport(retries=settings.SERVICE_HTTP_RETRY_ATTEMPTS),
+    )
+
+
+def check_jobs_status(sync_service: BaseImputationService, external_job_ids: List[str],
+                      concurrency: int = None) -> Dict[str, Dict[str, Any]]:
+    """Run concurrent status checks for a service from synchronous code."""
+    concurrency = concurrency or settings.JOB_STATUS_POLL_CONCURRENCY
+
+    async def run():
+        async with _async_client(sync_service, concurrency) as client:
+            async_service = AsyncImputationService(sync_service, client)
+            return await async_service.get_jobs_status(external_job_ids, concurrency)
+
+    return asyncio.run(run())
@@ -0,0 +1,92 @@
+"""
+Cached, versioned snapshot of the service and reference panel catalog.
+
+Rendered catalog responses are cached under the current catalog version.
+Any change to a service or panel bumps the version (model signals, and an
+explicit call after bulk panel syncs that bypass signals), so stale entries
+are never read again and simply expire. Responses carry an ETag and
+Last-Modified derived from the version so clients can revalidate with 304.
+"""
+import hashlib
+import uuid
+from typing import Any, Callable, Dict
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'imputation:catalog:version'
+
+
+def get_catalog_version() -> Dict[str, Any]:
+    """Current ``{'version', 'updated_at'}``, starting a new version if none is cached."""
+    current = cache.get(VERSION_KEY)
+    if current is None:
+        cache.add(VERSION_KEY, {'version': uuid.uuid4().hex, 'updated_at': timezone.now().timestamp()}, timeout=None)
+        current = cache.get(VERSION_KEY)
+    return current
+
+
+def invalidate_catalog():
+    """Start a new catalog version; snapshots cached under the old one are never read again."""
+    cache.set(VERSION_KEY, {'version': uuid.uuid4().hex, 'updated_at': timezone.now().timestamp()}, timeout=None)
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def _not_modified(request, etag: str, last_modified: int) -> bool:
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        # Weak comparison, as for GET in RFC 9110
+        tags = parse_etags(if_none_match)
+        return '*' in tags or etag in [_strip_weak(tag) for tag in tags]
+
+    if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def catalog_response(request, name: str, build: Callable[[], Any]) -> Response:
+    """Serve ``build()`` from the catalog cache with conditional GET support.
+
+    ``name`` identifies the view; the full request URL is part of the key so
+    filters, pages and absolute links in the data each get their own entry.
+    """
+    current = get_catalog_version()
+    digest = hashlib.sha256(f'{name}|{request.build_absolute_uri()}'.encode()).hexdigest()[:16]
+    etag = quote_etag(f"{current['version']}-{digest}")
+    last_modified = int(current['updated_at'])
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(last_modified),
+        'Cache-Control': 'no-cache',  # Cache, but revalidate every time
+    }
+
+    if _not_modified(request, etag, last_modified):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    key = f"imputation:catalog:{current['version']}:{digest}"
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout=settings.CATALOG_CACHE_TTL_SECONDS)
+    return Response(data, headers=headers)
+
+
+class CatalogCacheMixin:
+    """Serve a read-only viewset's list and retrieve from the catalog cache."""
+
+    def list(self, request, *args, **kwargs):
+        return catalog_response(
+            request, f'{type(self).__name__}.list',
+            lambda: super(CatalogCacheMixin, self).list(request, *args, **kwargs).data
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return catalog_response(
+            request, f'{type(self).__name__}.retrieve',
+            lambda: super(CatalogCacheMixin, self).retrieve(request, *args, **kwargs).data
+        )
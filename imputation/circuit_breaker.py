@@ -0,0 +1,117 @@
+"""
+Per-service circuit breaker backed by the shared cache.
+
+State lives in Redis (the default cache) so every web and Celery process
+sees the same view of a service: after repeated failures the circuit opens
+and calls fail fast until the cool-down has passed, then a single trial call
+decides whether to close it again.
+"""
+import logging
+import requests
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling a service whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Track consecutive failures for one service and short-circuit calls."""
+
+    def __init__(self, service_id: int, service_name: str = '', options: dict = None):
+        options = options or {}
+        self.service_id = service_id
+        self.service_name = service_name or str(service_id)
+        self.failure_threshold = options.get(
+            'circuit_failure_threshold', settings.SERVICE_CIRCUIT_FAILURE_THRESHOLD)
+        self.failure_window = options.get(
+            'circuit_failure_window_seconds', settings.SERVICE_CIRCUIT_FAILURE_WINDOW_SECONDS)
+        self.recovery_timeout = options.get(
+            'circuit_recovery_seconds', settings.SERVICE_CIRCUIT_RECOVERY_SECONDS)
+
+        prefix = f'imputation:circuit:{service_id}'
+        self.failures_key = f'{prefix}:failures'
+        self.open_key = f'{prefix}:open'
+        self.tripped_key = f'{prefix}:tripped'
+        self.trial_key = f'{prefix}:trial'
+
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected."""
+        try:
+            return cache.get(self.open_key) is not None
+        except Exception as e:
+            logger.warning(f"Circuit state unavailable for {self.service_name}: {e}")
+            return False
+
+    def before_call(self):
+        """Raise CircuitOpenError if the call must not be attempted."""
+        try:
+            if cache.get(self.open_key) is not None:
+                raise CircuitOpenError(f"Circuit open for {self.service_name}, failing fast")
+
+            # Half-open: let exactly one trial call through after the cool-down
+            if cache.get(self.tripped_key) is not None:
+                if not cache.add(self.trial_key, 1, timeout=self.recovery_timeout):
+                    raise CircuitOpenError(f"Circuit half-open for {self.service_name}, trial in progress")
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            logger.warning(f"Circuit state unavailable for {self.service_name}: {e}")
+
+    def record_success(self):
+        """Close the circuit and reset the failure count."""
+        try:
+            cache.delete_many([self.failures_key, self.tripped_key, self.trial_key])
+        except Exception as e:
+            logger.warning(f"Circuit state unavailable for {self.service_name}: {e}")
+
+    def record_failure(self):
+        """Count a failure and open the circuit once the threshold is reached."""
+        try:
+            if cache.get(self.tripped_key) is not None:
+                # The trial call failed, so go straight back to open
+                self._open()
+                return
+
+            cache.add(self.failures_key, 0, timeout=self.failure_window)
+            failures = cache.incr(self.failures_key)
+            if failures >= self.failure_threshold:
+                self._open()
+        except Exception as e:
+            logger.warning(f"Circuit state unavailable for {self.service_name}: {e}")
+
+    def record_outcomes(self, successes: int, failures: int):
+        """Record a batch of call outcomes in a few cache round trips.
+        
+        A batch without failures closes the circuit. Otherwise its failures
+        are added to the count, which starts afresh if any call in the batch
+        succeeded.
+        """
+        if not failures:
+            if successes:
+                self.record_success()
+            return
+        try:
+            if cache.get(self.tripped_key) is not None:
+                # The batch was the trial and it failed, so go straight back to open
+                self._open()
+                return
+
+            if successes:
+                cache.delete(self.failures_key)
+            cache.add(self.failures_key, 0, timeout=self.failure_window)
+            if cache.incr(self.failures_key, failures) >= self.failure_threshold:
+                self._open()
+        except Exception as e:
+            logger.warning(f"Circuit state unavailable for {self.service_name}: {e}")
+
+    def _open(self):
+        cache.set(self.open_key, 1, timeout=self.recovery_timeout)
+        cache.set(self.tripped_key, 1, timeout=self.recovery_timeout * 10)
+        cache.delete_many([self.failures_key, self.trial_key])
+        logger.warning(
+            f"Circuit opened for {self.service_name} for {self.recovery_timeout}s after repeated failures"
+        )
@@ -0,0 +1,136 @@
+"""
+Process-wide registry of pooled HTTP sessions for imputation services.
+
+Each service gets one keep-alive ``requests.Session`` per process, so repeated
+status polls and downloads against the same host reuse warm TCP/TLS
+connections instead of opening a new one for every task run.
+"""
+import os
+import logging
+import threading
+from typing import Dict, Tuple
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .models import ImputationService
+
+logger = logging.getLogger(__name__)
+
+# Keyed on (service ID, config fingerprint); insertion order is age
+_sessions: Dict[Tuple[int, tuple], requests.Session] = {}
+_sessions_lock = threading.Lock()
+_sessions_pid = os.getpid()
+
+# Sessions kept per service, so instances loaded before and after a config
+# change do not keep rebuilding each other's session
+MAX_SESSIONS_PER_SERVICE = 2
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default (connect, read) timeout to every request.
+
+    ``requests`` has no session-wide timeout, so without this a call that
+    does not pass ``timeout`` can block forever.
+    """
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def _config_fingerprint(service: ImputationService) -> tuple:
+    """Identify the configuration a session was built from."""
+    config = getattr(service, 'configuration', None)
+    return (service.api_url, service.updated_at, config.updated_at if config else None)
+
+
+def service_timeout(service: ImputationService) -> Tuple[float, float]:
+    """(connect, read) timeout in seconds for calls to a service."""
+    config = getattr(service, 'configuration', None)
+    options = config.settings if config and config.settings else {}
+    return (
+        options.get('connect_timeout_seconds', settings.SERVICE_HTTP_CONNECT_TIMEOUT_SECONDS),
+        config.timeout_seconds if config else settings.SERVICE_HTTP_TIMEOUT_SECONDS,
+    )
+
+
+def status_timeout(service: ImputationService) -> Tuple[float, float]:
+    """(connect, read) timeout for job status checks, which should answer quickly."""
+    connect_timeout, read_timeout = service_timeout(service)
+    return connect_timeout, min(read_timeout, settings.SERVICE_HTTP_STATUS_READ_TIMEOUT_SECONDS)
+
+
+def _build_session(service: ImputationService) -> requests.Session:
+    """Create a pooled session configured from the service's ServiceConfiguration."""
+    config = getattr(service, 'configuration', None)
+    options = config.settings if config and config.settings else {}
+
+    retry_attempts = config.retry_attempts if config else settings.SERVICE_HTTP_RETRY_ATTEMPTS
+    retry = Retry(
+        total=retry_attempts,
+        # A read timeout already waited the full read timeout, and the server
+        # may still be working; only connection failures and 502-504s are retried
+        read=0,
+        backoff_factor=options.get('retry_backoff_factor', settings.SERVICE_HTTP_RETRY_BACKOFF),
+        status_forcelist=(502, 503, 504),
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,  # never replay POSTs
+        raise_on_status=False,
+    )
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=options.get('pool_connections', settings.SERVICE_HTTP_POOL_CONNECTIONS),
+        pool_maxsize=options.get('pool_maxsize', settings.SERVICE_HTTP_POOL_MAXSIZE),
+        max_retries=retry,
+        timeout=service_timeout(service),
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    if config:
+        if config.api_key:
+            session.headers.update({'Authorization': f'Bearer {config.api_key}'})
+
+        # Add any additional headers
+        if config.additional_headers:
+            session.headers.update(config.additional_headers)
+
+    return session
+
+
+def get_session(service: ImputationService) -> requests.Session:
+    """Return the pooled session for a service, building it on first use.
+
+    A new session is built when the service or its configuration changes.
+    Superseded sessions are dropped from the registry but never closed, as
+    other threads may still be using them; they are released once
+    unreferenced. The registry is reset after a fork so worker processes
+    never share sockets with their parent.
+    """
+    global _sessions_pid
+
+    key = (service.pk, _config_fingerprint(service))
+    with _sessions_lock:
+        if _sessions_pid != os.getpid():
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+
+        session = _sessions.get(key)
+        if session is not None:
+            return session
+
+        session = _build_session(service)
+        _sessions[key] = session
+        logger.debug(f"Created pooled HTTP session for {service.name}")
+
+        # Forget the oldest sessions for this service beyond the limit
+        service_keys = [cached_key for cached_key in _sessions if cached_key[0] == service.pk]
+        for stale_key in service_keys[:-MAX_SESSIONS_PER_SERVICE]:
+            del _sessions[stale_key]
+        return session
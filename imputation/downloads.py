@@ -0,0 +1,149 @@
+"""
+Streaming delivery of locally stored result files.
+"""
+import os
+import re
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from .models import ResultFile
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+def _file_etag(result_file: ResultFile, stat: os.stat_result) -> str:
+    """Strong ETag from the verified checksum, or from size and mtime."""
+    if result_file.checksum:
+        return quote_etag(result_file.checksum)
+    return quote_etag(f"{stat.st_size:x}-{int(stat.st_mtime):x}")
+
+
+def _parse_range(header: str, size: int):
+    """Parse a single ``bytes=`` range into inclusive (start, end).
+
+    Returns None when the header should be ignored (absent, malformed or
+    multi-range) and raises ValueError when the range is unsatisfiable.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the final N bytes
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def _if_none_match(request, etag: str) -> bool:
+    """Check If-None-Match with weak comparison, as RFC 9110 requires for GET."""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if not if_none_match:
+        return False
+    tags = parse_etags(if_none_match)
+    return '*' in tags or etag in [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+
+
+def _if_range_matches(request, etag: str, mtime: float) -> bool:
+    """Check the If-Range precondition; a missing header always matches."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(mtime) <= since
+
+
+def _file_range_iterator(path: str, start: int, length: int):
+    """Yield ``length`` bytes of a file starting at ``start``."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = f.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+def _accel_redirect_path(path: str):
+    """Map a file under RESULT_FILES_ROOT to its nginx internal location."""
+    prefix = settings.RESULT_FILES_ACCEL_REDIRECT_PREFIX
+    if not prefix:
+        return None
+    root = os.path.abspath(settings.RESULT_FILES_ROOT)
+    path = os.path.abspath(path)
+    if os.path.commonpath([root, path]) != root:
+        return None
+    return f"{prefix.rstrip('/')}/{os.path.relpath(path, root)}"
+
+
+def serve_result_file(request, result_file: ResultFile):
+    """Serve a local result file without loading it into memory.
+
+    Supports single ``Range`` requests with ``If-Range`` revalidation and
+    conditional ``If-None-Match`` requests. When
+    ``RESULT_FILES_ACCEL_REDIRECT_PREFIX`` is set, the transfer is handed to
+    nginx with ``X-Accel-Redirect`` instead, and nginx handles ranges itself.
+    """
+    path = result_file.file_path
+    stat = os.stat(path)
+    size = stat.st_size
+    etag = _file_etag(result_file, stat)
+    disposition = f'attachment; filename="{result_file.filename}"'
+
+    if _if_none_match(request, etag):
+        response = HttpResponse(status=304)
+        response['ETag'] = etag
+        return response
+
+    accel_path = _accel_redirect_path(path)
+    if accel_path:
+        response = HttpResponse(content_type='application/octet-stream')
+        response['X-Accel-Redirect'] = accel_path
+        response['Content-Disposition'] = disposition
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        return response
+
+    byte_range = None
+    if _if_range_matches(request, etag, stat.st_mtime):
+        try:
+            byte_range = _parse_range(request.META.get('HTTP_RANGE'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(
+            _file_range_iterator(path, start, length),
+            status=206,
+            content_type='application/octet-stream'
+        )
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = str(length)
+    else:
+        response = FileResponse(open(path, 'rb'), content_type='application/octet-stream')
+        response['Content-Length'] = str(size)
+
+    response['Content-Disposition'] = disposition
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
@@ -0,0 +1,185 @@
+"""
+Background health probes for imputation services.
+
+Services are probed on a schedule by the ``probe_services_health`` task,
+which records every result as a ServiceHealthCheck row. The health endpoints
+answer from each service's latest row without calling out to the service,
+and the same rows make up the health history.
+"""
+import logging
+import time
+from typing import Any, Dict, Iterable
+import requests
+from requests.exceptions import RequestException, Timeout, ConnectionError
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from .models import ImputationService, ServiceHealthCheck
+
+logger = logging.getLogger(__name__)
+
+PROBE_LOCK_KEY = 'imputation:health:probe:lock'
+
+
+def health_check_url(service: ImputationService) -> str:
+    """URL that is probed to decide whether a service is up."""
+    if service.api_type == 'ga4gh':
+        # GA4GH WES services have a service-info endpoint
+        return f"{service.api_url.rstrip('/')}/service-info"
+    if service.api_type == 'michigan':
+        # Michigan Imputation Server - use API endpoint for proper API response
+        return f"{service.api_url.rstrip('/')}/api/"
+    return service.api_url
+
+
+def probe_service(service: ImputationService) -> Dict[str, Any]:
+    """Probe a service once and return its health snapshot."""
+    test_url = health_check_url(service)
+    timeout = settings.SERVICE_HEALTH_PROBE_TIMEOUT_SECONDS
+    snapshot = {
+        'service_id': service.id,
+        'service_name': service.name,
+        'test_url': test_url,
+        'status_code': None,
+        'response_time_ms': None,
+    }
+
+    started = time.monotonic()
+    try:
+        response = requests.get(
+            test_url,
+            timeout=timeout,
+            verify=False,  # Skip SSL verification for demo services
+            allow_redirects=True
+        )
+        snapshot['status_code'] = response.status_code
+        snapshot['response_time_ms'] = int(response.elapsed.total_seconds() * 1000)
+
+        if response.status_code in [200, 201, 202]:
+            snapshot.update({
+                'status': 'healthy',
+                'message': f'Service responded with HTTP {response.status_code}',
+            })
+        elif service.api_type == 'michigan' and response.status_code == 401:
+            # For Michigan services, HTTP 401 (Unauthorized) indicates the API is online and functioning
+            snapshot.update({
+                'status': 'healthy',
+                'message': f'Michigan API responded with HTTP {response.status_code} (API online, authentication required)',
+                'api_response': 'Unauthorized - API is functioning properly',
+            })
+        else:
+            snapshot.update({
+                'status': 'unhealthy',
+                'message': f'Service responded with HTTP {response.status_code}',
+                'error': f'HTTP_{response.status_code}',
+            })
+
+    except Timeout:
+        snapshot.update({
+            'status': 'unhealthy',
+            'message': f'Service request timed out ({timeout}s)',
+            'error': 'Timeout',
+        })
+    except ConnectionError:
+        snapshot.update({
+            'status': 'unhealthy',
+            'message': 'Unable to connect to service',
+            'error': 'ConnectionError',
+        })
+    except RequestException as exc:
+        snapshot.update({
+            'status': 'unhealthy',
+            'message': f'Request failed: {str(exc)}',
+            'error': 'RequestException',
+        })
+    except Exception as exc:
+        snapshot.update({
+            'status': 'unhealthy',
+            'message': f'Unexpected error: {str(exc)}',
+            'error': type(exc).__name__,
+        })
+
+    if snapshot['response_time_ms'] is None:
+        snapshot['response_time_ms'] = int((time.monotonic() - started) * 1000)
+    if snapshot['status'] != 'healthy':
+        logger.warning(f"Health probe failed for {service.name} at {test_url}: {snapshot['message']}")
+
+    snapshot['checked_at'] = timezone.now().isoformat()
+    return snapshot
+
+
+def health_check_from_snapshot(service: ImputationService, snapshot: Dict[str, Any]) -> ServiceHealthCheck:
+    """Build an unsaved ServiceHealthCheck recording a probe result."""
+    healthy = snapshot['status'] == 'healthy'
+    return ServiceHealthCheck(
+        service=service,
+        is_healthy=healthy,
+        status_code=snapshot['status_code'],
+        latency_ms=snapshot['response_time_ms'],
+        error_class='' if healthy else snapshot.get('error', ''),
+        error_message='' if healthy else snapshot['message'],
+    )
+
+
+def _snapshot_from_check(service: ImputationService, check: ServiceHealthCheck) -> Dict[str, Any]:
+    if check.is_healthy:
+        message = f'Service responded with HTTP {check.status_code}'
+    else:
+        message = check.error_message
+    snapshot = {
+        'service_id': service.id,
+        'service_name': service.name,
+        'status': 'healthy' if check.is_healthy else 'unhealthy',
+        'message': message,
+        'test_url': health_check_url(service),
+        'status_code': check.status_code,
+        'response_time_ms': check.latency_ms,
+        'checked_at': check.checked_at.isoformat(),
+    }
+    if check.error_class:
+        snapshot['error'] = check.error_class
+    return snapshot
+
+
+def get_health_snapshots(services: Iterable[ImputationService]) -> Dict[int, Dict[str, Any]]:
+    """Latest recorded check per service id; services never probed get a placeholder."""
+    services = list(services)
+    latest = ServiceHealthCheck.objects.filter(service=OuterRef('pk')).order_by('-checked_at', '-id').values('id')[:1]
+    check_ids = dict(
+        ImputationService.objects.filter(pk__in=[service.pk for service in services])
+        .annotate(latest_check_id=Subquery(latest))
+        .values_list('pk', 'latest_check_id')
+    )
+    checks = ServiceHealthCheck.objects.in_bulk([pk for pk in check_ids.values() if pk is not None])
+
+    snapshots = {}
+    for service in services:
+        check = checks.get(check_ids.get(service.pk))
+        if check is not None:
+            snapshots[service.id] = _snapshot_from_check(service, check)
+            continue
+        snapshots[service.id] = {
+            'service_id': service.id,
+            'service_name': service.name,
+            'status': 'unknown',
+            'message': 'Health check pending',
+            'test_url': health_check_url(service),
+            'checked_at': None,
+        }
+    return snapshots
+
+
+def schedule_probe() -> bool:
+    """Queue a probe of all active services unless one is already running."""
+    if not cache.add(PROBE_LOCK_KEY, 1, timeout=settings.SERVICE_HEALTH_CHECK_DEADLINE_SECONDS * 2):
+        return False
+
+    from .tasks import probe_services_health
+    try:
+        probe_services_health.delay()
+    except Exception as e:
+        cache.delete(PROBE_LOCK_KEY)
+        logger.error(f"Could not queue service health probe: {e}")
+        return False
+    return True
@@ -0,0 +1,166 @@
+"""
+Django command to check that hot job queries use indexes.
+
+Seeds a large synthetic dataset inside a transaction, runs EXPLAIN on the
+queries behind the job list, status poller, status history and result file
+endpoints, and fails if any of them falls back to a sequential scan. The
+transaction is rolled back afterwards, so existing data is never touched.
+
+The project has no backend test suite to hold these plan assertions, so the
+check ships as this command. It needs PostgreSQL, exits non-zero on a
+sequential scan, and should be run after migrations that touch job indexes.
+"""
+import json
+import random
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from imputation.models import (
+    ImputationService, ReferencePanel, ImputationJob, JobStatusUpdate, ResultFile
+)
+from imputation.search import SEARCH_ORDERING, search_jobs
+from imputation.tasks import ACTIVE_JOB_STATUSES, TERMINAL_JOB_STATUSES
+
+CHECKED_TABLES = {
+    ImputationJob._meta.db_table,
+    JobStatusUpdate._meta.db_table,
+    ResultFile._meta.db_table,
+}
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded data."""
+
+
+class Command(BaseCommand):
+    """Django command to check query plans of hot job queries."""
+
+    help = 'Seed a large dataset and fail if hot job queries use sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=100000,
+            help='Number of jobs to seed (default: 100000)',
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=200,
+            help='Number of users the jobs are spread over (default: 200)',
+        )
+        parser.add_argument(
+            '--updates-per-job',
+            type=int,
+            default=5,
+            help='Status updates seeded per job (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        """Entry point for command."""
+        if connection.vendor != 'postgresql':
+            raise CommandError('Query plan checks require PostgreSQL')
+
+        failures = []
+        try:
+            with transaction.atomic():
+                user, job = self.seed(options['jobs'], options['users'], options['updates_per_job'])
+                with connection.cursor() as cursor:
+                    for table in CHECKED_TABLES:
+                        cursor.execute(f'ANALYZE {table}')
+
+                for name, queryset in self.hot_queries(user, job):
+                    plan = json.loads(queryset.explain(format='json'))
+                    seq_scans = sorted(self.sequential_scans(plan[0]['Plan']))
+                    if seq_scans:
+                        failures.append(name)
+                        self.stdout.write(self.style.ERROR(
+                            f'✗ {name}: sequential scan on {", ".join(seq_scans)}'
+                        ))
+                    else:
+                        self.stdout.write(self.style.SUCCESS(f'✓ {name}'))
+                raise Rollback()
+        except Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f'{len(failures)} queries fell back to sequential scans')
+        self.stdout.write(self.style.SUCCESS('All hot queries use indexes'))
+
+    def seed(self, job_count, user_count, updates_per_job):
+        """Create services, users, jobs, status updates and result files."""
+        self.stdout.write(f'Seeding {job_count} jobs for {user_count} users...')
+        run_id = timezone.now().strftime('%Y%m%d%H%M%S')
+        service = ImputationService.objects.create(
+            name=f'Query plan check {run_id}',
+            service_type='h3africa',
+            api_url='https://example.org/api/',
+        )
+        panel = ReferencePanel.objects.create(
+            service=service, name='Seed panel', panel_id=f'seed-{run_id}',
+            population='African', build='hg38',
+        )
+        users = User.objects.bulk_create([
+            User(username=f'plan-check-{run_id}-{i}') for i in range(user_count)
+        ])
+
+        now = timezone.now()
+        statuses = TERMINAL_JOB_STATUSES * 33 + ACTIVE_JOB_STATUSES  # ~3% active
+        jobs = ImputationJob.objects.bulk_create([
+            ImputationJob(
+                user=random.choice(users),
+                name=f'Seed job {i}',
+                service=service,
+                reference_panel=panel,
+                status=random.choice(statuses),
+                external_job_id=f'seed-{i}',
+            )
+            for i in range(job_count)
+        ], batch_size=5000)
+
+        for offset in range(0, len(jobs), 1000):
+            batch = jobs[offset:offset + 1000]
+
+            # Spread creation times over a year so the ordering indexes matter
+            for job in batch:
+                job.created_at = now - timedelta(minutes=random.randint(0, 525600))
+            ImputationJob.objects.bulk_update(batch, ['created_at'])
+
+            JobStatusUpdate.objects.bulk_create([
+                JobStatusUpdate(job=job, status=job.status, progress_percentage=step * 20)
+                for job in batch for step in range(updates_per_job)
+            ])
+            ResultFile.objects.bulk_create([
+                ResultFile(job=job, file_type='imputed_data', filename=f'{job.external_job_id}.vcf.gz')
+                for job in batch if job.status == 'completed'
+            ])
+
+        return users[0], jobs[0]
+
+    def hot_queries(self, user, job):
+        """The queries behind the job list, search, poller, history and file endpoints."""
+        return [
+            ('jobs by user, newest first',
+             ImputationJob.objects.filter(user=user).order_by('-created_at', '-id')[:21]),
+            ('jobs by user and status',
+             ImputationJob.objects.filter(user=user, status='completed').order_by('-created_at')[:21]),
+            ('active jobs for the status poller',
+             ImputationJob.objects.filter(status__in=ACTIVE_JOB_STATUSES)
+             .exclude(external_job_id='').order_by('service_id', 'created_at')),
+            ('status updates for a job, newest first',
+             JobStatusUpdate.objects.filter(job=job).order_by('-timestamp', '-id')[:51]),
+            ('available result files for a job',
+             ResultFile.objects.filter(job=job, is_available=True)),
+            ('job search by name',
+             search_jobs(ImputationJob.objects.filter(user=user), job.name).order_by(*SEARCH_ORDERING)[:21]),
+        ]
+
+    def sequential_scans(self, node):
+        """Yield tables under a plan node that are read with a Seq Scan."""
+        if node.get('Node Type') == 'Seq Scan' and node.get('Relation Name') in CHECKED_TABLES:
+            yield node['Relation Name']
+        for child in node.get('Plans', []):
+            yield from self.sequential_scans(child)
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
-from imputation.models import ImputationService, ReferencePanel
+from imputation.models import ImputationService
 from imputation.admin_views import sync_ga4gh_panels
+from imputation.services import apply_panel_sync
 
 
 class Command(BaseCommand):
@@ -17,25 +18,19 @@ class Command(BaseCommand):
         for service in ga4gh_services:
             self.stdout.write(f'\nUpdating panels for: {service.name}')
             
-            # Delete existing panels
-            old_count = service.reference_panels.count()
-            service.reference_panels.all().delete()
-            self.stdout.write(f'  - Removed {old_count} old panels')
-            
-            # Sync new H3Africa-style panels
+            # Sync H3Africa-style panels; panels no longer offered are deactivated,
+            # not deleted, so existing jobs keep their reference panel
             try:
                 panels = sync_ga4gh_panels(service)
+                result = apply_panel_sync(service, panels)
                 
-                # Create new panels
                 for panel_data in panels:
-                    panel = ReferencePanel.objects.create(
-                        service=service,
-                        **panel_data
-                    )
-                    self.stdout.write(f'  - Added: {panel.name}')
+                    self.stdout.write(f"  - {panel_data['name']}")
                 
                 self.stdout.write(self.style.SUCCESS(
-                    f'  ✓ Successfully added {len(panels)} H3Africa panels'
+                    f"  ✓ Synced {len(panels)} H3Africa panels "
+                    f"({result['created']} added, {result['updated']} updated, "
+                    f"{result['deactivated']} deactivated)"
                 ))
                 
             except Exception as e:
@@ -48,11 +43,11 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('Panel Update Summary:'))
         
         for service in ga4gh_services:
-            panel_count = service.reference_panels.count()
-            self.stdout.write(f'  - {service.name}: {panel_count} panels')
+            active_panels = service.reference_panels.filter(is_active=True)
+            self.stdout.write(f'  - {service.name}: {active_panels.count()} active panels')
             
             # Show panel populations
-            populations = service.reference_panels.values_list('population', flat=True).distinct()
+            populations = active_panels.values_list('population', flat=True).distinct()
             if populations:
                 self.stdout.write(f'    Populations: {", ".join(populations)}')
         
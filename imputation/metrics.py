@@ -0,0 +1,157 @@
+"""
+Prometheus metrics for the web app, Celery workers and outbound service calls.
+
+Set ``PROMETHEUS_MULTIPROC_DIR`` when running several gunicorn workers so
+the exposition aggregates samples from all of them.
+
+Celery workers run in their own containers and expose their own endpoint on
+``CELERY_METRICS_PORT`` when it is set. With the default prefork pool, tasks
+run in child processes while the endpoint is served by the parent, so task
+metrics only reach it through ``PROMETHEUS_MULTIPROC_DIR``. It must be set
+(to an empty, writable directory) before the worker starts, and the endpoint
+is not started without it.
+"""
+import os
+import re
+import time
+import logging
+import redis
+from celery.signals import task_prerun, task_postrun, task_retry, worker_ready
+from django.conf import settings
+from django.db.models import Count
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, REGISTRY, CONTENT_TYPE_LATEST,
+    generate_latest, multiprocess, start_http_server
+)
+from prometheus_client.core import GaugeMetricFamily
+
+logger = logging.getLogger(__name__)
+
+HTTP_REQUEST_LATENCY = Histogram(
+    'imputation_http_request_duration_seconds',
+    'Latency of API requests by view and action.',
+    ['view', 'action', 'method', 'status'],
+)
+
+TASK_RUNTIME = Histogram(
+    'imputation_celery_task_duration_seconds',
+    'Runtime of Celery tasks by final state.',
+    ['task', 'state'],
+    buckets=(0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800, float('inf')),
+)
+TASK_RETRIES = Counter(
+    'imputation_celery_task_retries_total',
+    'Celery task retries.',
+    ['task'],
+)
+
+SERVICE_REQUEST_LATENCY = Histogram(
+    'imputation_service_request_duration_seconds',
+    'Latency of calls to external imputation services.',
+    ['service', 'method', 'endpoint', 'outcome'],
+)
+SERVICE_REQUEST_ERRORS = Counter(
+    'imputation_service_request_errors_total',
+    'Failed calls to external imputation services.',
+    ['service', 'method', 'endpoint', 'error'],
+)
+
+# Path segments that carry ids (anything containing a digit) are collapsed
+# so endpoints such as jobs/<id>/results stay low-cardinality labels.
+ID_SEGMENT_RE = re.compile(r'[^/]*\d[^/]*')
+
+_task_started = {}
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """Turn a concrete service endpoint into a label, e.g. ``jobs/:id/results``."""
+    path = endpoint.split('?', 1)[0].strip('/')
+    return ID_SEGMENT_RE.sub(':id', path) or '/'
+
+
+def observe_service_request(service_name: str, method: str, endpoint: str,
+                            duration: float, error: Exception = None):
+    """Record one outbound call made by BaseImputationService._make_request."""
+    endpoint = normalize_endpoint(endpoint)
+    outcome = 'error' if error is not None else 'success'
+    SERVICE_REQUEST_LATENCY.labels(service_name, method, endpoint, outcome).observe(duration)
+    if error is not None:
+        SERVICE_REQUEST_ERRORS.labels(service_name, method, endpoint, type(error).__name__).inc()
+
+
+class ImputationCollector:
+    """Scrape-time gauges for Celery queue depth and active jobs by status."""
+
+    def collect(self):
+        from .models import ImputationJob
+        from .tasks import ACTIVE_JOB_STATUSES
+
+        queue_depth = GaugeMetricFamily(
+            'imputation_celery_queue_depth', 'Messages waiting in each Celery queue.', labels=['queue'])
+        try:
+            client = redis.Redis.from_url(settings.CELERY_BROKER_URL)
+            for queue in settings.METRICS_CELERY_QUEUES:
+                queue_depth.add_metric([queue], client.llen(queue))
+        except redis.RedisError as e:
+            logger.warning(f"Could not read Celery queue depth: {e}")
+        yield queue_depth
+
+        active_jobs = GaugeMetricFamily(
+            'imputation_active_jobs', 'Jobs not yet in a terminal state, by status.', labels=['status'])
+        counts = dict(
+            ImputationJob.objects.filter(status__in=ACTIVE_JOB_STATUSES)
+            .values_list('status').annotate(count=Count('id'))
+        )
+        for status in ACTIVE_JOB_STATUSES:
+            active_jobs.add_metric([status], counts.get(status, 0))
+        yield active_jobs
+
+
+# Scrape-time gauges live in their own registry so they are only collected
+# by the web process, never by Celery workers.
+_collector_registry = CollectorRegistry()
+_collector_registry.register(ImputationCollector())
+
+
+def _process_registry() -> CollectorRegistry:
+    """Registry for this process's metrics, aggregated across workers in multiprocess mode."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics():
+    """Return the exposition body and content type for the web process."""
+    body = generate_latest(_process_registry()) + generate_latest(_collector_registry)
+    return body, CONTENT_TYPE_LATEST
+
+
+@task_prerun.connect
+def _task_prerun(task_id=None, **kwargs):
+    _task_started[task_id] = time.monotonic()
+
+
+@task_postrun.connect
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None and task is not None:
+        TASK_RUNTIME.labels(task.name, state or 'UNKNOWN').observe(time.monotonic() - started)
+
+
+@task_retry.connect
+def _task_retry(sender=None, **kwargs):
+    if sender is not None:
+        TASK_RETRIES.labels(sender.name).inc()
+
+
+@worker_ready.connect
+def _start_worker_metrics_server(**kwargs):
+    port = settings.CELERY_METRICS_PORT
+    if port and not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        # Tasks run in pool children; the parent alone would only ever report zeros
+        logger.error("Not serving Celery metrics: CELERY_METRICS_PORT requires PROMETHEUS_MULTIPROC_DIR")
+    elif port:
+        start_http_server(port, registry=_process_registry())
+        logger.info(f"Serving Celery metrics on port {port}")
@@ -0,0 +1,126 @@
+"""
+Middleware for the imputation app.
+"""
+import re
+import time
+import random
+import logging
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from .metrics import HTTP_REQUEST_LATENCY
+
+logger = logging.getLogger(__name__)
+
+# Literals are replaced so queries differing only in parameters share a shape
+STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST_RE = re.compile(r'\bIN \((?:\s*(?:\?|%s)\s*,?)+\)', re.IGNORECASE)
+
+
+def resolve_view_labels(request):
+    """(view, action) for a request, using the DRF viewset action when there is one."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched', ''
+
+    view_class = getattr(match.func, 'cls', None)
+    if view_class is None:
+        return match.view_name or match.func.__name__, ''
+
+    actions = getattr(match.func, 'actions', None) or {}
+    return view_class.__name__, actions.get(request.method.lower(), request.method.lower())
+
+
+class MetricsMiddleware:
+    """Record request latency per view and viewset action."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.monotonic()
+        response = self.get_response(request)
+
+        view, action = resolve_view_labels(request)
+        HTTP_REQUEST_LATENCY.labels(view, action, request.method, response.status_code).observe(
+            time.monotonic() - started
+        )
+        return response
+
+
+def query_shape(sql: str) -> str:
+    """Normalize a SQL statement so repeated queries with different parameters match."""
+    shape = STRING_LITERAL_RE.sub('?', sql)
+    shape = NUMBER_LITERAL_RE.sub('?', shape)
+    return IN_LIST_RE.sub('IN (?)', shape)
+
+
+class QueryRecorder:
+    """``execute_wrapper`` callable that counts and times every query."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.monotonic() - started
+            self.count += 1
+            self.shapes[query_shape(sql)] += 1
+
+    def repeated_shapes(self, threshold: int):
+        """Query shapes run at least ``threshold`` times, most frequent first."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+class QueryProfilingMiddleware:
+    """Opt-in per-request SQL profiling with N+1 detection.
+    
+    Enabled by SQL_PROFILING_ENABLED. Requests over the query-count or
+    SQL-time budget, or that repeat one query shape SQL_PROFILING_REPEAT_THRESHOLD
+    times or more, are logged with their view name. A sample of responses
+    carries X-DB-* headers so regressions show up under real traffic.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SQL_PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.query_budget = settings.SQL_PROFILING_QUERY_BUDGET
+        self.time_budget_ms = settings.SQL_PROFILING_TIME_BUDGET_MS
+        self.repeat_threshold = settings.SQL_PROFILING_REPEAT_THRESHOLD
+        self.header_sample_rate = settings.SQL_PROFILING_HEADER_SAMPLE_RATE
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        sql_time_ms = int(recorder.duration * 1000)
+        repeated = recorder.repeated_shapes(self.repeat_threshold)
+
+        if recorder.count > self.query_budget or sql_time_ms > self.time_budget_ms or repeated:
+            view, action = resolve_view_labels(request)
+            view_name = f"{view}.{action}" if action else view
+            message = (
+                f"SQL budget exceeded for {request.method} {request.path} ({view_name}): "
+                f"{recorder.count} queries, {sql_time_ms}ms"
+            )
+            for shape, count in repeated[:3]:
+                message += f"\n  repeated {count}x: {shape[:300]}"
+            logger.warning(message)
+
+        if random.random() < self.header_sample_rate:
+            response['X-DB-Query-Count'] = str(recorder.count)
+            response['X-DB-Time-Ms'] = str(sql_time_ms)
+            response['X-DB-Repeated-Queries'] = str(sum(count for _, count in repeated))
+        return response
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imputation', '0005_add_location_to_service'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imputationjob',
+            name='upload_confirmed_bytes',
+            field=models.BigIntegerField(default=0, help_text='Bytes of the input file confirmed by the service'),
+        ),
+        migrations.AddField(
+            model_name='imputationjob',
+            name='upload_id',
+            field=models.CharField(blank=True, help_text='Service-side ID of an in-progress chunked upload', max_length=200),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imputation', '0006_imputationjob_upload_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imputationjob',
+            name='input_file_checksum',
+            field=models.CharField(blank=True, help_text='SHA-256 of the uploaded input file', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='imputationjob',
+            name='remote_file_id',
+            field=models.CharField(blank=True, help_text='Service-side ID of the uploaded input file', max_length=200),
+        ),
+    ]
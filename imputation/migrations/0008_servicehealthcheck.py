@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imputation', '0007_imputationjob_remote_file'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceHealthCheck',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_healthy', models.BooleanField()),
+                ('latency_ms', models.IntegerField(blank=True, null=True)),
+                ('panels_count', models.IntegerField(blank=True, null=True)),
+                ('error_class', models.CharField(blank=True, max_length=100)),
+                ('error_message', models.TextField(blank=True)),
+                ('checked_at', models.DateTimeField(auto_now_add=True)),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='health_checks', to='imputation.imputationservice')),
+            ],
+            options={
+                'ordering': ['-checked_at'],
+                'indexes': [models.Index(fields=['service', '-checked_at'], name='imputation__service_f350cb_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:53
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the tables against writes
+    atomic = False
+
+    dependencies = [
+        ('imputation', '0008_servicehealthcheck'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='imputationjob',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='imputation_job_user_created'),
+        ),
+        AddIndexConcurrently(
+            model_name='imputationjob',
+            index=models.Index(fields=['user', 'status', '-created_at'], name='imputation_job_user_status'),
+        ),
+        AddIndexConcurrently(
+            model_name='imputationjob',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'queued', 'running'])), fields=['service', 'created_at'], name='imputation_job_active'),
+        ),
+        AddIndexConcurrently(
+            model_name='jobstatusupdate',
+            index=models.Index(fields=['job', '-timestamp', '-id'], name='imputation_jsu_job_timestamp'),
+        ),
+        AddIndexConcurrently(
+            model_name='resultfile',
+            index=models.Index(fields=['job', 'is_available'], name='imputation_rf_job_available'),
+        ),
+    ]
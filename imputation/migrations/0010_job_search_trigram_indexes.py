@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:54
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    # Build the indexes without locking the table against writes
+    atomic = False
+
+    dependencies = [
+        ('imputation', '0009_hot_query_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='imputationjob',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='imputation_job_name_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='imputationjob',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('description'), name='gin_trgm_ops'), name='imputation_job_desc_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='imputationjob',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('external_job_id'), name='gin_trgm_ops'), name='imputation_job_extid_trgm'),
+        ),
+    ]
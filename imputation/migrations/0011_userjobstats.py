@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:57
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_user_job_stats(apps, schema_editor):
+    """Seed counters from the jobs that already exist."""
+    ImputationJob = apps.get_model('imputation', 'ImputationJob')
+    UserJobStats = apps.get_model('imputation', 'UserJobStats')
+    
+    stats = {}
+    rows = ImputationJob.objects.values_list('user_id', 'status').annotate(count=models.Count('id')).order_by()
+    for user_id, status, count in rows:
+        row = stats.setdefault(user_id, UserJobStats(user_id=user_id))
+        row.total += count
+        if hasattr(row, status):
+            setattr(row, status, count)
+    UserJobStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('imputation', '0010_job_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserJobStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='job_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('queued', models.IntegerField(default=0)),
+                ('running', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'User job stats',
+            },
+        ),
+        migrations.RunPython(populate_user_job_stats, migrations.RunPython.noop),
+    ]
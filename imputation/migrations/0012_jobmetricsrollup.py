@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-17 00:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imputation', '0011_userjobstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobMetricsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hourly'), ('day', 'Daily')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('submitted', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('median_execution_seconds', models.FloatField(blank=True, null=True)),
+                ('p95_execution_seconds', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('reference_panel', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='metrics_rollups', to='imputation.referencepanel')),
+                ('service', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metrics_rollups', to='imputation.imputationservice')),
+            ],
+            options={
+                'ordering': ['period', 'bucket_start'],
+                'indexes': [models.Index(fields=['period', 'service', 'reference_panel', 'bucket_start'], name='imputation_rollup_series'), models.Index(fields=['period', 'bucket_start'], name='imputation_rollup_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imputation', '0012_jobmetricsrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicehealthcheck',
+            name='status_code',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
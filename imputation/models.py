@@ -1,8 +1,15 @@
 """
 Django models for the federated imputation system.
 """
-from django.db import models
+from collections import Counter
+from typing import Dict, Optional
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Upper
 from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.utils import timezone
 import uuid
 
@@ -47,47 +54,9 @@ class ImputationService(models.Model):
         return self.name
     
     def get_service_info(self):
-        """Get cached service info from api_config or fetch fresh data."""
-        import requests
-        from datetime import datetime, timedelta
-        
-        # Check if we have cached info that's less than 1 hour old
-        if self.api_config and '_service_info' in self.api_config:
-            cached_info = self.api_config['_service_info']
-            if 'timestamp' in cached_info:
-                timestamp = datetime.fromisoformat(cached_info['timestamp'])
-                if datetime.now() - timestamp < timedelta(hours=1):
-                    return cached_info.get('data', {})
-        
-        # Fetch fresh data
-        if self.api_type == 'ga4gh':
-            try:
-                url = self.api_url
-                if not url.endswith('/service-info'):
-                    url = f"{url.rstrip('/')}/service-info"
-                
-                headers = {'Accept': 'application/json'}
-                if self.api_key:
-                    headers['Authorization'] = f'Bearer {self.api_key}'
-                
-                response = requests.get(url, headers=headers, timeout=10)
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Cache the response
-                    if not self.api_config:
-                        self.api_config = {}
-                    self.api_config['_service_info'] = {
-                        'timestamp': datetime.now().isoformat(),
-                        'data': data
-                    }
-                    self.save()
-                    
-                    return data
-            except Exception:
-                pass
-        
-        return {}
+        """Get cached GA4GH service info; a stale or missing entry is refreshed in the background."""
+        from .service_info import get_service_info
+        return get_service_info(self)
 
 
 class ReferencePanel(models.Model):
@@ -154,6 +123,12 @@ class ImputationJob(models.Model):
     input_file_size = models.BigIntegerField(null=True, blank=True)
     result_files = models.JSONField(default=list)  # List of result file URLs/paths
     
+    # Resumable upload checkpoint
+    upload_id = models.CharField(max_length=200, blank=True, help_text="Service-side ID of an in-progress chunked upload")
+    upload_confirmed_bytes = models.BigIntegerField(default=0, help_text="Bytes of the input file confirmed by the service")
+    remote_file_id = models.CharField(max_length=200, blank=True, help_text="Service-side ID of the uploaded input file")
+    input_file_checksum = models.CharField(max_length=64, blank=True, help_text="SHA-256 of the uploaded input file")
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -167,10 +142,51 @@ class ImputationJob(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Per-user job lists, keyset-paginated on (created_at, id)
+            models.Index(fields=['user', '-created_at', '-id'], name='imputation_job_user_created'),
+            models.Index(fields=['user', 'status', '-created_at'], name='imputation_job_user_status'),
+            # Active jobs picked up by the status poller
+            models.Index(
+                fields=['service', 'created_at'],
+                condition=models.Q(status__in=['pending', 'queued', 'running']),
+                name='imputation_job_active',
+            ),
+            # Trigram indexes for case-insensitive substring search (icontains)
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='imputation_job_name_trgm'),
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'), name='imputation_job_desc_trgm'),
+            GinIndex(OpClass(Upper('external_job_id'), name='gin_trgm_ops'), name='imputation_job_extid_trgm'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.service.name})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so save() can move the user's counters
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        """Save the job and keep the owner's UserJobStats counters in step."""
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        loaded_status = getattr(self, '_loaded_status', None)
+        
+        status_saved = adding or update_fields is None or 'status' in update_fields
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                UserJobStats.record_transition(self.user_id, None, self.status)
+            elif loaded_status and status_saved:
+                UserJobStats.record_transition(self.user_id, loaded_status, self.status)
+        
+        # A save that skipped the status column leaves the stored status unchanged
+        if status_saved:
+            self._loaded_status = self.status
+    
     @property
     def duration(self):
         """Calculate job duration if completed."""
@@ -180,8 +196,12 @@ class ImputationJob(models.Model):
             return timezone.now() - self.started_at
         return None
     
-    def update_status(self, status, progress=None, error_message=None):
-        """Update job status and related fields."""
+    def update_status(self, status, progress=None, error_message=None, commit=True):
+        """Update job status and related fields.
+        
+        Pass ``commit=False`` to only apply the changes in memory, e.g. when
+        the caller persists a batch of jobs with ``bulk_update``.
+        """
         self.status = status
         if progress is not None:
             self.progress_percentage = progress
@@ -196,7 +216,8 @@ class ImputationJob(models.Model):
             if self.started_at:
                 self.execution_time_seconds = (self.completed_at - self.started_at).total_seconds()
         
-        self.save()
+        if commit:
+            self.save()
 
 
 class JobStatusUpdate(models.Model):
@@ -211,6 +232,9 @@ class JobStatusUpdate(models.Model):
     
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['job', '-timestamp', '-id'], name='imputation_jsu_job_timestamp'),
+        ]
     
     def __str__(self):
         return f"{self.job.name} - {self.status} ({self.progress_percentage}%)"
@@ -240,11 +264,80 @@ class ResultFile(models.Model):
     
     class Meta:
         ordering = ['file_type', 'filename']
+        indexes = [
+            models.Index(fields=['job', 'is_available'], name='imputation_rf_job_available'),
+        ]
     
     def __str__(self):
         return f"{self.job.name} - {self.filename}"
 
 
+class ServiceHealthCheck(models.Model):
+    """Model recording the outcome of a periodic service health check."""
+    
+    service = models.ForeignKey(ImputationService, on_delete=models.CASCADE, related_name='health_checks')
+    is_healthy = models.BooleanField()
+    status_code = models.IntegerField(null=True, blank=True)  # HTTP status of the probe, if it got a response
+    latency_ms = models.IntegerField(null=True, blank=True)
+    panels_count = models.IntegerField(null=True, blank=True)
+    error_class = models.CharField(max_length=100, blank=True)  # Exception class name, e.g. Timeout
+    error_message = models.TextField(blank=True)
+    checked_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-checked_at']
+        indexes = [
+            models.Index(fields=['service', '-checked_at']),
+        ]
+    
+    def __str__(self):
+        state = 'healthy' if self.is_healthy else 'unhealthy'
+        return f"{self.service.name} - {state} at {self.checked_at}"
+
+
+class JobMetricsRollup(models.Model):
+    """Model holding precomputed job throughput and duration per time bucket.
+    
+    Rows with no reference panel aggregate the whole service. Submissions are
+    bucketed by created_at, completions and failures by completed_at.
+    """
+    
+    PERIOD_CHOICES = [
+        ('hour', 'Hourly'),
+        ('day', 'Daily'),
+    ]
+    
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    bucket_start = models.DateTimeField()
+    service = models.ForeignKey(ImputationService, on_delete=models.CASCADE, related_name='metrics_rollups')
+    reference_panel = models.ForeignKey(
+        ReferencePanel, on_delete=models.CASCADE, null=True, blank=True, related_name='metrics_rollups'
+    )
+    submitted = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    median_execution_seconds = models.FloatField(null=True, blank=True)
+    p95_execution_seconds = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['period', 'bucket_start']
+        indexes = [
+            models.Index(fields=['period', 'service', 'reference_panel', 'bucket_start'], name='imputation_rollup_series'),
+            models.Index(fields=['period', 'bucket_start'], name='imputation_rollup_bucket'),
+        ]
+    
+    def __str__(self):
+        scope = self.reference_panel.name if self.reference_panel_id else self.service.name
+        return f"{scope} - {self.period} {self.bucket_start}"
+    
+    @property
+    def success_rate(self):
+        """Share of finished jobs that completed, as a percentage."""
+        finished = self.completed + self.failed
+        return (self.completed / finished * 100) if finished else None
+
+
 class ServiceConfiguration(models.Model):
     """Model to store service-specific configuration and credentials."""
     
@@ -283,4 +376,87 @@ class UserServiceAccess(models.Model):
         unique_together = ['user', 'service']
     
     def __str__(self):
-        return f"{self.user.username} - {self.service.name}" 
\ No newline at end of file
+        return f"{self.user.username} - {self.service.name}" 
+
+
+class UserJobStats(models.Model):
+    """Per-user job counters by status, maintained on every status change.
+    
+    Counters are moved by ImputationJob.save(), the job post_delete signal
+    and the batched status poller; reconcile_user_job_stats corrects drift.
+    """
+    
+    STATUS_FIELDS = [status for status, _ in ImputationJob.STATUS_CHOICES]
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='job_stats')
+    total = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+    queued = models.IntegerField(default=0)
+    running = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = 'User job stats'
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.total} jobs"
+    
+    @property
+    def active(self):
+        """Jobs not yet in a terminal state."""
+        return self.pending + self.queued + self.running
+    
+    @classmethod
+    def transition_deltas(cls, old_status: Optional[str], new_status: Optional[str]) -> Counter:
+        """Counter changes for a job moving between statuses (None = created/deleted)."""
+        deltas = Counter()
+        if old_status is None:
+            deltas['total'] += 1
+        elif old_status in cls.STATUS_FIELDS:
+            deltas[old_status] -= 1
+        if new_status is None:
+            deltas['total'] -= 1
+        elif new_status in cls.STATUS_FIELDS:
+            deltas[new_status] += 1
+        return deltas
+    
+    @classmethod
+    def apply_deltas(cls, deltas: Dict[int, Counter], create: bool = True):
+        """Apply counter changes per user, e.g. ``{user_id: {'running': -1, 'completed': 1}}``."""
+        for user_id, changes in deltas.items():
+            changes = {field: delta for field, delta in changes.items() if delta}
+            if not changes:
+                continue
+            if create:
+                cls.objects.get_or_create(user_id=user_id)
+            cls.objects.filter(user_id=user_id).update(
+                updated_at=timezone.now(),
+                **{field: F(field) + delta for field, delta in changes.items()}
+            )
+    
+    @classmethod
+    def record_transition(cls, user_id: int, old_status: Optional[str], new_status: Optional[str]):
+        """Move one job's contribution between counters."""
+        if old_status == new_status:
+            return
+        # Deletions never create a row: the user may be being deleted too
+        cls.apply_deltas({user_id: cls.transition_deltas(old_status, new_status)}, create=new_status is not None)
+
+
+@receiver(post_delete, sender=ImputationJob)
+def remove_deleted_job_from_stats(sender, instance, **kwargs):
+    """Drop a deleted job from its owner's counters."""
+    status = instance.__dict__.get('status')
+    if status:
+        UserJobStats.record_transition(instance.user_id, status, None)
+
+
+@receiver([post_save, post_delete], sender=ImputationService)
+@receiver([post_save, post_delete], sender=ReferencePanel)
+def invalidate_catalog_on_change(sender, **kwargs):
+    """Start a new catalog version once the change is committed."""
+    from .catalog import invalidate_catalog
+    transaction.on_commit(invalidate_catalog)
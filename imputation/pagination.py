@@ -0,0 +1,139 @@
+"""
+Keyset (cursor) pagination for large, append-mostly tables.
+
+Each page is located with a WHERE clause on the sort key of the last row of
+the previous page instead of OFFSET, and no COUNT(*) is run, so every page
+costs the same as the first one.
+"""
+import json
+import uuid
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from functools import reduce
+from typing import Any, Sequence
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+def _cursor_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(obj, ordering: Sequence[str]) -> str:
+    """Opaque cursor pointing just past ``obj`` in the given ordering."""
+    values = [_cursor_value(getattr(obj, field.lstrip('-'))) for field in ordering]
+    return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+class KeysetPagination(BasePagination):
+    """Forward-only cursor pagination over a composite, unique sort key.
+
+    ``ordering`` must end in a unique column (normally ``id``) so that rows
+    sharing a timestamp are neither skipped nor repeated.
+    """
+
+    ordering = ('-timestamp', '-id')
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_ordering(self, view=None) -> Sequence[str]:
+        """Views may override the sort key with a ``keyset_ordering`` attribute."""
+        return getattr(view, 'keyset_ordering', None) or self.ordering
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def decode_cursor(self, model, cursor: str) -> list:
+        """Decode a cursor into field values for the current ordering."""
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError(cursor)
+            return [
+                self._to_python(model, field.lstrip('-'), value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def _to_python(self, model, name: str, value: Any) -> Any:
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Annotations such as the float search rank are JSON-native
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                raise ValueError(value)
+            return value
+        return field.to_python(value)
+
+    def cursor_filter(self, values: list) -> Q:
+        """Rows strictly after ``values``: (a, b) < (x, y) expanded per column."""
+        conditions = []
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal_prefix = {
+                previous.lstrip('-'): value
+                for previous, value in zip(self.ordering[:index], values[:index])
+            }
+            conditions.append(Q(**equal_prefix, **{f'{name}__{lookup}': values[index]}))
+
+        # The redundant bound on the leading column lets the index do a range scan
+        leading = self.ordering[0]
+        leading_lookup = 'lte' if leading.startswith('-') else 'gte'
+        bound = Q(**{f"{leading.lstrip('-')}__{leading_lookup}": values[0]})
+        return bound & reduce(lambda a, b: a | b, conditions)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.cursor_filter(self.decode_cursor(queryset.model, cursor)))
+
+        # One extra row tells us whether there is a next page
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_cursor = encode_cursor(rows[-1], self.ordering) if self.has_next else None
+        return rows
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
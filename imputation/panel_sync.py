@@ -0,0 +1,90 @@
+"""
+Federation-wide reference panel sync runs.
+
+A run syncs any number of services in parallel, one Celery task per
+service, and each service commits on its own, so a slow or failing service
+does not hold up the rest. Progress for each service is kept in the shared
+cache under the run ID, where the sync status endpoint reads it.
+"""
+import logging
+import uuid
+from typing import Any, Dict, Iterable, Optional
+from celery import group
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from .models import ImputationService
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATES = ('success', 'failed')
+
+
+def _run_key(run_id: str) -> str:
+    return f'imputation:panel_sync:{run_id}'
+
+
+def _service_key(run_id: str, service_id: int) -> str:
+    # One key per service so parallel tasks never overwrite each other's progress
+    return f'imputation:panel_sync:{run_id}:{service_id}'
+
+
+def update_service_progress(run_id: str, service_id: int, **fields):
+    """Merge ``fields`` into a service's progress entry for a run."""
+    key = _service_key(run_id, service_id)
+    progress = cache.get(key) or {'service_id': service_id}
+    progress.update(fields)
+    cache.set(key, progress, timeout=settings.PANEL_SYNC_PROGRESS_TTL_SECONDS)
+
+
+def start_panel_sync(service_ids: Optional[Iterable[int]] = None, requested_by: str = '') -> str:
+    """Start syncing the active services in ``service_ids`` (all when None) and return the run ID."""
+    from .tasks import sync_service_panels
+
+    services = ImputationService.objects.filter(is_active=True)
+    if service_ids is not None:
+        services = services.filter(id__in=list(service_ids))
+    services = list(services.values_list('id', 'name'))
+
+    run_id = uuid.uuid4().hex
+    timeout = settings.PANEL_SYNC_PROGRESS_TTL_SECONDS
+    cache.set_many({
+        _service_key(run_id, service_id): {'service_id': service_id, 'service_name': name, 'status': 'pending'}
+        for service_id, name in services
+    }, timeout=timeout)
+    cache.set(_run_key(run_id), {
+        'run_id': run_id,
+        'service_ids': [service_id for service_id, _ in services],
+        'requested_by': requested_by,
+        'started_at': timezone.now().isoformat(),
+    }, timeout=timeout)
+
+    if services:
+        group(sync_service_panels.s(run_id, service_id) for service_id, _ in services).apply_async()
+    logger.info(f"Started panel sync run {run_id} for {len(services)} services")
+    return run_id
+
+
+def get_panel_sync_status(run_id: str) -> Optional[Dict[str, Any]]:
+    """Run metadata with per-service progress and totals, or None for an unknown run."""
+    run = cache.get(_run_key(run_id))
+    if run is None:
+        return None
+
+    keys = [_service_key(run_id, service_id) for service_id in run['service_ids']]
+    entries = cache.get_many(keys)
+    services = [
+        entries.get(key) or {'service_id': service_id, 'status': 'unknown'}
+        for key, service_id in zip(keys, run['service_ids'])
+    ]
+
+    counts = {}
+    for progress in services:
+        counts[progress['status']] = counts.get(progress['status'], 0) + 1
+
+    return {
+        **run,
+        'finished': all(progress['status'] in FINISHED_STATES for progress in services),
+        'counts': counts,
+        'services': services,
+    }
@@ -0,0 +1,111 @@
+"""
+Hourly and daily job metrics rollups.
+
+``rollup_job_metrics`` recomputes every bucket that overlaps a recent window
+and replaces the stored rows, so it is idempotent and late status changes
+are picked up on the next run. Charts read from JobMetricsRollup and never
+scan ImputationJob. Percentiles use PERCENTILE_CONT, so PostgreSQL is required.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Tuple
+from django.db import transaction
+from django.db.models import Aggregate, Count, FloatField, Q
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from .models import ImputationJob, JobMetricsRollup
+
+logger = logging.getLogger(__name__)
+
+PERIODS = [period for period, _ in JobMetricsRollup.PERIOD_CHOICES]
+
+# Rollups are kept per service, and per service and reference panel
+GROUPINGS = [
+    ('service_id',),
+    ('service_id', 'reference_panel_id'),
+]
+
+
+class PercentileCont(Aggregate):
+    """PostgreSQL ``percentile_cont(fraction) WITHIN GROUP (ORDER BY expression)``."""
+
+    function = 'PERCENTILE_CONT'
+    name = 'PercentileCont'
+    template = '%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = FloatField()
+
+    def __init__(self, expression, fraction: float, **extra):
+        if not 0 <= fraction <= 1:
+            raise ValueError('fraction must be between 0 and 1')
+        super().__init__(expression, fraction=float(fraction), **extra)
+
+
+def bucket_floor(moment: datetime, period: str) -> datetime:
+    """Start of the bucket containing ``moment``."""
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if period == 'day':
+        moment = moment.replace(hour=0)
+    return moment
+
+
+def _aggregate(window_start: datetime, period: str, group: Tuple[str, ...]) -> Dict[tuple, Dict]:
+    """Counters and percentiles per (bucket, *group) for buckets from ``window_start``."""
+    rows = {}
+
+    submitted = ImputationJob.objects.filter(created_at__gte=window_start).annotate(
+        bucket=Trunc('created_at', period)
+    ).values('bucket', *group).annotate(submitted=Count('id')).order_by()
+    for row in submitted:
+        key = (row['bucket'],) + tuple(row[field] for field in group)
+        rows.setdefault(key, {})['submitted'] = row['submitted']
+
+    completed = Q(status='completed')
+    finished = ImputationJob.objects.filter(
+        completed_at__gte=window_start, status__in=['completed', 'failed']
+    ).annotate(
+        bucket=Trunc('completed_at', period)
+    ).values('bucket', *group).annotate(
+        completed=Count('id', filter=completed),
+        failed=Count('id', filter=Q(status='failed')),
+        median_execution_seconds=PercentileCont('execution_time_seconds', 0.5, filter=completed),
+        p95_execution_seconds=PercentileCont('execution_time_seconds', 0.95, filter=completed),
+    ).order_by()
+    for row in finished:
+        key = (row['bucket'],) + tuple(row[field] for field in group)
+        rows.setdefault(key, {}).update(
+            completed=row['completed'],
+            failed=row['failed'],
+            median_execution_seconds=row['median_execution_seconds'],
+            p95_execution_seconds=row['p95_execution_seconds'],
+        )
+
+    return rows
+
+
+def rollup_job_metrics(lookback_hours: int) -> Dict[str, int]:
+    """Recompute hourly and daily rollups for buckets overlapping the last ``lookback_hours``."""
+    now = timezone.now()
+    written = {}
+
+    for period in PERIODS:
+        window_start = bucket_floor(now - timedelta(hours=lookback_hours), period)
+        rollups = []
+        for group in GROUPINGS:
+            for key, values in _aggregate(window_start, period, group).items():
+                bucket_start, service_id, *panel = key
+                rollups.append(JobMetricsRollup(
+                    period=period,
+                    bucket_start=bucket_start,
+                    service_id=service_id,
+                    reference_panel_id=panel[0] if panel else None,
+                    **values
+                ))
+
+        # Replace the whole window so buckets that emptied out are dropped too
+        with transaction.atomic():
+            JobMetricsRollup.objects.filter(period=period, bucket_start__gte=window_start).delete()
+            JobMetricsRollup.objects.bulk_create(rollups, batch_size=1000)
+        written[period] = len(rollups)
+
+    logger.info(f"Rolled up job metrics: {written}")
+    return written
@@ -0,0 +1,37 @@
+"""
+Indexed, ranked job search.
+
+Matching uses case-insensitive substring lookups, which PostgreSQL answers
+from the trigram GIN indexes on UPPER(name), UPPER(description) and
+UPPER(external_job_id) instead of scanning every job. Results are ranked by
+trigram word similarity over the job's own fields, as a double precision
+float that round-trips exactly through the keyset pagination cursor.
+"""
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import FloatField, Q
+from django.db.models.functions import Cast, Greatest
+from .models import ImputationService
+
+SEARCH_FIELDS = ['name', 'description', 'external_job_id']
+
+# Keyset ordering for ranked results, best match first
+SEARCH_ORDERING = ('-search_rank', '-created_at', '-id')
+
+
+def search_jobs(queryset, term: str):
+    """Filter jobs matching ``term`` and annotate them with ``search_rank``."""
+    term = term.strip()
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__icontains': term})
+
+    # The services table is tiny, so resolve matching services up front and
+    # keep the job query, ranking included, to the jobs table alone
+    service_ids = list(ImputationService.objects.filter(name__icontains=term).values_list('id', flat=True))
+    if service_ids:
+        condition |= Q(service_id__in=service_ids)
+
+    similarity = Greatest(*(TrigramWordSimilarity(term, field) for field in SEARCH_FIELDS))
+    return queryset.filter(condition).annotate(
+        search_rank=Cast(similarity, FloatField())
+    )
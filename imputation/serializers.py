@@ -2,11 +2,15 @@
 Django REST Framework serializers for the imputation app.
 """
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.models import User
 from .models import (
     ImputationService, ReferencePanel, ImputationJob,
-    JobStatusUpdate, ResultFile, UserServiceAccess
+    JobStatusUpdate, ResultFile, ServiceHealthCheck, UserServiceAccess,
+    JobMetricsRollup
 )
+from .pagination import KeysetPagination, encode_cursor
+from .service_info import get_service_info_snapshot
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -35,7 +39,54 @@ class ImputationServiceSerializer(serializers.ModelSerializer):
     
     def get_reference_panels_count(self, obj):
         """Get the count of active reference panels for this service."""
+        # Querysets annotated with active_panels_count avoid a COUNT per service
+        if hasattr(obj, 'active_panels_count'):
+            return obj.active_panels_count
         return obj.reference_panels.filter(is_active=True).count()
+    
+    def to_representation(self, instance):
+        """Expose cached GA4GH service info under ``api_config['_service_info']``."""
+        data = super().to_representation(instance)
+        if instance.api_type == 'ga4gh' and 'api_config' in data:
+            snapshot = get_service_info_snapshot(instance)
+            if snapshot:
+                data['api_config'] = {**(data['api_config'] or {}), '_service_info': snapshot}
+        return data
+
+
+class ImputationServiceSummarySerializer(serializers.ModelSerializer):
+    """Compact ImputationService representation for nesting in job lists."""
+    
+    class Meta:
+        model = ImputationService
+        fields = ['id', 'name', 'service_type', 'api_type', 'location']
+        read_only_fields = fields
+
+
+class ServiceHealthCheckSerializer(serializers.ModelSerializer):
+    """Serializer for ServiceHealthCheck model."""
+    
+    class Meta:
+        model = ServiceHealthCheck
+        fields = [
+            'id', 'is_healthy', 'status_code', 'latency_ms', 'panels_count',
+            'error_class', 'error_message', 'checked_at'
+        ]
+        read_only_fields = fields
+
+
+class JobMetricsRollupSerializer(serializers.ModelSerializer):
+    """Serializer for JobMetricsRollup model."""
+    
+    success_rate = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = JobMetricsRollup
+        fields = [
+            'bucket_start', 'service', 'reference_panel', 'submitted', 'completed', 'failed',
+            'success_rate', 'median_execution_seconds', 'p95_execution_seconds'
+        ]
+        read_only_fields = fields
 
 
 class ReferencePanelSerializer(serializers.ModelSerializer):
@@ -96,7 +147,7 @@ class ImputationJobListSerializer(serializers.ModelSerializer):
     """Serializer for ImputationJob list view."""
     
     user = UserSerializer(read_only=True)
-    service = ImputationServiceSerializer(read_only=True)
+    service = ImputationServiceSummarySerializer(read_only=True)
     reference_panel = ReferencePanelSerializer(read_only=True)
     duration_display = serializers.SerializerMethodField()
     
@@ -132,7 +183,8 @@ class ImputationJobDetailSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     service = ImputationServiceSerializer(read_only=True)
     reference_panel = ReferencePanelSerializer(read_only=True)
-    status_updates = JobStatusUpdateSerializer(many=True, read_only=True)
+    status_updates = serializers.SerializerMethodField()
+    status_updates_cursor = serializers.SerializerMethodField()
     files = ResultFileSerializer(many=True, read_only=True)
     duration_display = serializers.SerializerMethodField()
     input_file_size_display = serializers.SerializerMethodField()
@@ -146,7 +198,7 @@ class ImputationJobDetailSerializer(serializers.ModelSerializer):
             'input_file_size', 'input_file_size_display', 'result_files',
             'created_at', 'updated_at', 'started_at', 'completed_at',
             'execution_time_seconds', 'duration_display', 'error_message',
-            'service_response', 'status_updates', 'files'
+            'service_response', 'status_updates', 'status_updates_cursor', 'files'
         ]
         read_only_fields = [
             'id', 'user', 'status', 'progress_percentage', 'external_job_id',
@@ -169,6 +221,30 @@ class ImputationJobDetailSerializer(serializers.ModelSerializer):
                 return f"{seconds}s"
         return None
     
+    def _recent_status_updates(self, obj):
+        """Newest status updates plus one extra row to detect older ones."""
+        # Prefetched by ImputationJobViewSet; otherwise query a bounded slice
+        updates = getattr(obj, 'recent_status_updates', None)
+        if updates is None:
+            updates = list(obj.status_updates.order_by(*KeysetPagination.ordering)[
+                :settings.JOB_DETAIL_STATUS_UPDATES_LIMIT + 1
+            ])
+            obj.recent_status_updates = updates
+        return updates
+    
+    def get_status_updates(self, obj):
+        """Get the most recent status updates, newest first."""
+        updates = self._recent_status_updates(obj)[:settings.JOB_DETAIL_STATUS_UPDATES_LIMIT]
+        return JobStatusUpdateSerializer(updates, many=True).data
+    
+    def get_status_updates_cursor(self, obj):
+        """Cursor for the status_updates action to load older updates, if any."""
+        updates = self._recent_status_updates(obj)
+        limit = settings.JOB_DETAIL_STATUS_UPDATES_LIMIT
+        if len(updates) > limit:
+            return encode_cursor(updates[limit - 1], KeysetPagination.ordering)
+        return None
+    
     def get_input_file_size_display(self, obj):
         """Get human-readable input file size."""
         if obj.input_file_size:
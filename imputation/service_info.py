@@ -0,0 +1,128 @@
+"""
+Cache for GA4GH service-info responses.
+
+Reads are served from the shared cache and never block on outbound HTTP or
+write to the database. Entries older than SERVICE_INFO_TTL_SECONDS are still
+served while a single background task refreshes them (stale-while-revalidate);
+a cache lock makes sure only one refresh per service is in flight.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from .catalog import invalidate_catalog
+from .clients import get_session
+from .models import ImputationService
+
+logger = logging.getLogger(__name__)
+
+
+def _entry_key(service_id: int) -> str:
+    return f'imputation:service_info:{service_id}'
+
+
+def _refresh_lock_key(service_id: int) -> str:
+    return f'imputation:service_info:{service_id}:refresh'
+
+
+def get_cached_entry(service: ImputationService) -> Optional[Dict[str, Any]]:
+    """Return the raw cache entry ``{'data', 'fetched_at'}`` for a service."""
+    return cache.get(_entry_key(service.id))
+
+
+def get_service_info(service: ImputationService) -> Dict[str, Any]:
+    """Return cached service-info, scheduling a refresh when missing or stale.
+
+    Until the first fetch completes, the snapshot stored in
+    ``api_config['_service_info']`` by older versions (or by panel sync) is
+    used as a fallback.
+    """
+    if service.api_type != 'ga4gh':
+        return {}
+
+    entry = get_cached_entry(service)
+    if entry is None:
+        schedule_refresh(service)
+        legacy = (service.api_config or {}).get('_service_info') or {}
+        return legacy.get('data', {})
+
+    if get_service_info_age(service, entry) > timedelta(seconds=settings.SERVICE_INFO_TTL_SECONDS):
+        schedule_refresh(service)
+    return entry['data']
+
+
+def get_service_info_snapshot(service: ImputationService) -> Optional[Dict[str, Any]]:
+    """Cached service-info in the ``{'timestamp', 'data'}`` shape that API
+    clients read from ``api_config['_service_info']``."""
+    data = get_service_info(service)
+    entry = get_cached_entry(service)
+    if entry:
+        return {'timestamp': entry['fetched_at'], 'data': entry['data']}
+    return (service.api_config or {}).get('_service_info') if data else None
+
+
+def get_service_info_age(service: ImputationService, entry: Dict[str, Any] = None) -> Optional[timedelta]:
+    """Age of the cached service-info, or None if nothing is cached."""
+    entry = entry or get_cached_entry(service)
+    if not entry:
+        return None
+    return timezone.now() - datetime.fromisoformat(entry['fetched_at'])
+
+
+def schedule_refresh(service: ImputationService):
+    """Queue a background refresh unless one is already in flight."""
+    lock_key = _refresh_lock_key(service.id)
+    if not cache.add(lock_key, 1, timeout=settings.SERVICE_INFO_REFRESH_LOCK_SECONDS):
+        return
+
+    from .tasks import refresh_service_info
+    try:
+        refresh_service_info.delay(service.id)
+    except Exception as e:
+        cache.delete(lock_key)
+        logger.error(f"Could not queue service-info refresh for {service.name}: {e}")
+
+
+def fetch_service_info(service: ImputationService) -> Dict[str, Any]:
+    """Fetch service-info from the service's GA4GH endpoint."""
+    url = service.api_url
+    if not url.endswith('/service-info'):
+        url = f"{url.rstrip('/')}/service-info"
+
+    headers = {'Accept': 'application/json'}
+    if service.api_key:
+        headers['Authorization'] = f'Bearer {service.api_key}'
+
+    # The session applies the service's (connect, read) deadline
+    response = get_session(service).get(url, headers=headers)
+    response.raise_for_status()
+    return response.json()
+
+
+def store_service_info(service: ImputationService, data: Dict[str, Any]):
+    """Cache a service-info response; entries are kept well past their TTL so
+    they can be served stale while a refresh runs."""
+    cache.set(
+        _entry_key(service.id),
+        {'data': data, 'fetched_at': timezone.now().isoformat()},
+        timeout=settings.SERVICE_INFO_STALE_TTL_SECONDS
+    )
+    # Catalog responses embed the service-info snapshot
+    invalidate_catalog()
+
+
+def refresh(service: ImputationService) -> Dict[str, Any]:
+    """Fetch and cache service-info, releasing the single-flight lock."""
+    try:
+        data = fetch_service_info(service)
+        store_service_info(service, data)
+        return data
+    finally:
+        cache.delete(_refresh_lock_key(service.id))
+
+
+def invalidate(service: ImputationService):
+    """Drop the cached service-info so the next read schedules a refresh."""
+    cache.delete(_entry_key(service.id))
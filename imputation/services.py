@@ -1,62 +1,145 @@
 """
 Service integration classes for external imputation services.
 """
+import os
+import time
+import hashlib
 import requests
 import logging
-from typing import Dict, List, Optional, Any
+from typing import BinaryIO, Dict, List, Optional, Any
+from urllib.parse import urlsplit
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from requests_toolbelt import MultipartEncoder
+from .catalog import invalidate_catalog
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .clients import get_session, service_timeout, status_timeout
+from .metrics import observe_service_request
 from .models import ImputationService, ReferencePanel, ImputationJob
 
 logger = logging.getLogger(__name__)
 
 
+class ChecksumMismatchError(Exception):
+    """Raised when a downloaded file does not match its published checksum."""
+
+
 class BaseImputationService:
     """Base class for imputation service integrations."""
     
+    # Endpoint templates, shared with the asyncio client in async_services
+    reference_panels_endpoint = ''
+    job_status_endpoint = 'jobs/{external_job_id}'
+    results_endpoint = 'jobs/{external_job_id}/results'
+    
     def __init__(self, service: ImputationService):
         self.service = service
         self.api_url = service.api_url
         self.config = getattr(service, 'configuration', None)
-        self.session = requests.Session()
-        self._setup_authentication()
-    
-    def _setup_authentication(self):
-        """Setup authentication headers and session configuration."""
-        if self.config:
-            if self.config.api_key:
-                self.session.headers.update({'Authorization': f'Bearer {self.config.api_key}'})
-            
-            # Add any additional headers
-            if self.config.additional_headers:
-                self.session.headers.update(self.config.additional_headers)
-            
-            # Set timeout
-            self.session.timeout = self.config.timeout_seconds
+        # Shared keep-alive session with auth headers, pooling, retries and deadlines
+        self.session = get_session(service)
+        self.circuit_breaker = CircuitBreaker(
+            service.id, service.name,
+            self.config.settings if self.config and self.config.settings else None
+        )
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """Make an authenticated request to the service API."""
         url = f"{self.api_url.rstrip('/')}/{endpoint.lstrip('/')}"
         
+        # Fail fast while the service is known to be down
+        self.circuit_breaker.before_call()
+        
+        started = time.monotonic()
         try:
             response = self.session.request(method, url, **kwargs)
             response.raise_for_status()
-            return response.json() if response.content else {}
+        except requests.exceptions.HTTPError as e:
+            observe_service_request(self.service.name, method, endpoint, time.monotonic() - started, e)
+            # Client errors mean the service is up; only 5xx count as failures
+            if e.response is not None and e.response.status_code >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success()
+            logger.error(f"API request failed for {self.service.name}: {e}")
+            raise
         except requests.exceptions.RequestException as e:
+            observe_service_request(self.service.name, method, endpoint, time.monotonic() - started, e)
+            self.circuit_breaker.record_failure()
             logger.error(f"API request failed for {self.service.name}: {e}")
             raise
+        
+        observe_service_request(self.service.name, method, endpoint, time.monotonic() - started)
+        self.circuit_breaker.record_success()
+        return response.json() if response.content else {}
     
     def get_reference_panels(self) -> List[Dict[str, Any]]:
         """Get available reference panels from the service."""
         raise NotImplementedError("Subclasses must implement get_reference_panels")
     
-    def submit_job(self, job: ImputationJob, file_data: bytes) -> str:
-        """Submit an imputation job to the service."""
+    def fetch_reference_panels(self, **kwargs) -> List[Dict[str, Any]]:
+        """Get reference panels, letting request and parsing errors propagate."""
+        response = self._make_request('GET', self.reference_panels_endpoint, **kwargs)
+        return self._parse_reference_panels(response)
+    
+    def _parse_reference_panels(self, response: Any) -> List[Dict[str, Any]]:
+        """Convert a reference panels response into panel dicts."""
+        raise NotImplementedError("Subclasses must implement _parse_reference_panels")
+    
+    def _parse_job_status(self, response: Any) -> Dict[str, Any]:
+        """Convert a job status response into our internal status dict."""
+        raise NotImplementedError("Subclasses must implement _parse_job_status")
+    
+    def _parse_results(self, response: Any) -> List[Dict[str, Any]]:
+        """Convert a job results response into result file dicts."""
+        raise NotImplementedError("Subclasses must implement _parse_results")
+    
+    def submit_job(self, job: ImputationJob, input_file: BinaryIO) -> str:
+        """Submit an imputation job to the service.
+        
+        ``input_file`` is an open binary file that is streamed to the service,
+        so implementations must not read it into memory.
+        """
         raise NotImplementedError("Subclasses must implement submit_job")
     
+    def _multipart_request(self, endpoint: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a multipart body that is streamed from disk rather than buffered."""
+        encoder = MultipartEncoder(fields=fields)
+        return self._make_request(
+            'POST', endpoint,
+            data=encoder,
+            headers={'Content-Type': encoder.content_type}
+        )
+    
     def get_job_status(self, external_job_id: str) -> Dict[str, Any]:
         """Get the status of a submitted job."""
         raise NotImplementedError("Subclasses must implement get_job_status")
     
+    def get_jobs_status(self, external_job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the status of a batch of submitted jobs, keyed by external job ID.
+        
+        With JOB_STATUS_POLL_ASYNC the checks run concurrently on an event
+        loop; otherwise there is one blocking request per job over the shared
+        session. Jobs whose check failed are left out of the result.
+        """
+        if settings.JOB_STATUS_POLL_ASYNC:
+            from .async_services import check_jobs_status
+            return check_jobs_status(self, external_job_ids)
+        
+        statuses = {}
+        for external_job_id in external_job_ids:
+            try:
+                statuses[external_job_id] = self.get_job_status(external_job_id)
+            except CircuitOpenError as e:
+                # Keep what was fetched; the remaining jobs are left for the next poll
+                logger.warning(f"Stopping status checks on {self.service.name} after {len(statuses)} jobs: {e}")
+                break
+            except Exception as e:
+                # A failed check says nothing about the job; skip it this round
+                logger.error(f"Status check for {external_job_id} on {self.service.name} failed: {e}")
+        return statuses
+    
     def download_results(self, external_job_id: str) -> List[Dict[str, Any]]:
         """Get download URLs for job results."""
         raise NotImplementedError("Subclasses must implement download_results")
@@ -64,34 +147,82 @@ class BaseImputationService:
     def cancel_job(self, external_job_id: str) -> bool:
         """Cancel a submitted job."""
         raise NotImplementedError("Subclasses must implement cancel_job")
+    
+    def _is_api_host(self, url: str) -> bool:
+        """Whether ``url`` has the same scheme and host as the service API."""
+        target, api = urlsplit(url), urlsplit(self.api_url)
+        return (target.scheme, target.netloc) == (api.scheme, api.netloc)
+    
+    def fetch_result_file(self, download_url: str, destination: str, expected_checksum: str = '') -> Dict[str, Any]:
+        """Stream a result file to local storage, verifying its checksum.
+        
+        The file is written to ``<destination>.part`` and only moved into place
+        once the MD5 (32 hex chars) or SHA-256 (64 hex chars) digest matches
+        ``expected_checksum``. Files without a published checksum are hashed
+        with SHA-256 so the stored value can be used later. Credentials are
+        only sent when the URL is on the service's own API host; other hosts
+        (e.g. signed storage URLs) are fetched without them.
+        """
+        expected_checksum = (expected_checksum or '').lower()
+        digest = hashlib.md5() if len(expected_checksum) == 32 else hashlib.sha256()
+        partial_path = f"{destination}.part"
+        file_size = 0
+        
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if self._is_api_host(download_url):
+            response = self.session.get(download_url, stream=True)
+        else:
+            response = requests.get(download_url, stream=True, timeout=service_timeout(self.service))
+        with response:
+            response.raise_for_status()
+            with open(partial_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=settings.RESULT_DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    file_size += len(chunk)
+        
+        checksum = digest.hexdigest()
+        if expected_checksum and checksum != expected_checksum:
+            os.remove(partial_path)
+            raise ChecksumMismatchError(
+                f"Checksum mismatch for {download_url}: expected {expected_checksum}, got {checksum}"
+            )
+        
+        os.replace(partial_path, destination)
+        return {'file_path': destination, 'file_size': file_size, 'checksum': checksum}
 
 
 class H3AfricaImputationService(BaseImputationService):
     """H3Africa Imputation Service integration."""
     
+    reference_panels_endpoint = 'reference-panels'
+    
     def get_reference_panels(self) -> List[Dict[str, Any]]:
         """Get available reference panels from H3Africa."""
         try:
-            response = self._make_request('GET', 'reference-panels')
-            panels = []
-            
-            for panel_data in response.get('data', []):
-                panels.append({
-                    'panel_id': panel_data.get('id'),
-                    'name': panel_data.get('name'),
-                    'description': panel_data.get('description', ''),
-                    'population': panel_data.get('population', ''),
-                    'build': panel_data.get('build', 'hg38'),
-                    'samples_count': panel_data.get('samples', 0),
-                    'variants_count': panel_data.get('variants', 0),
-                })
-            
-            return panels
+            return self.fetch_reference_panels()
         except Exception as e:
             logger.error(f"Failed to fetch H3Africa reference panels: {e}")
             return []
     
-    def submit_job(self, job: ImputationJob, file_data: bytes) -> str:
+    def _parse_reference_panels(self, response: Any) -> List[Dict[str, Any]]:
+        """Convert the H3Africa reference panels response."""
+        panels = []
+        
+        for panel_data in response.get('data', []):
+            panels.append({
+                'panel_id': panel_data.get('id'),
+                'name': panel_data.get('name'),
+                'description': panel_data.get('description', ''),
+                'population': panel_data.get('population', ''),
+                'build': panel_data.get('build', 'hg38'),
+                'samples_count': panel_data.get('samples', 0),
+                'variants_count': panel_data.get('variants', 0),
+            })
+        
+        return panels
+    
+    def submit_job(self, job: ImputationJob, input_file: BinaryIO) -> str:
         """Submit an imputation job to H3Africa."""
         payload = {
             'name': job.name,
@@ -99,67 +230,79 @@ class H3AfricaImputationService(BaseImputationService):
             'reference_panel': job.reference_panel.panel_id,
             'input_format': job.input_format,
             'build': job.build,
-            'phasing': job.phasing,
+            'phasing': str(job.phasing),
             'population': job.population or 'AFR',
         }
         
-        files = {
-            'input_file': ('data.vcf', file_data, 'application/octet-stream')
-        }
+        fields = dict(payload)
+        fields['input_file'] = ('data.vcf', input_file, 'application/octet-stream')
         
         try:
-            response = self._make_request('POST', 'jobs', data=payload, files=files)
+            response = self._multipart_request('jobs', fields)
             return response.get('job_id')
         except Exception as e:
             logger.error(f"Failed to submit job to H3Africa: {e}")
             raise
     
     def get_job_status(self, external_job_id: str) -> Dict[str, Any]:
-        """Get job status from H3Africa."""
-        try:
-            response = self._make_request('GET', f'jobs/{external_job_id}')
-            job_data = response.get('data', {})
-            
-            # Map H3Africa status to our internal status
-            status_mapping = {
-                'submitted': 'queued',
-                'waiting': 'queued',
-                'running': 'running',
-                'success': 'completed',
-                'error': 'failed',
-                'cancelled': 'cancelled',
-            }
-            
-            return {
-                'status': status_mapping.get(job_data.get('state'), 'pending'),
-                'progress': job_data.get('progress', 0),
-                'message': job_data.get('message', ''),
-                'external_data': job_data
-            }
-        except Exception as e:
-            logger.error(f"Failed to get H3Africa job status: {e}")
-            return {'status': 'failed', 'progress': 0, 'message': str(e)}
+        """Get job status from H3Africa.
+        
+        Transport, timeout and server errors are raised rather than reported
+        as a failed job, so callers leave the job untouched until the next poll.
+        """
+        response = self._make_request(
+            'GET', self.job_status_endpoint.format(external_job_id=external_job_id),
+            timeout=status_timeout(self.service)
+        )
+        return self._parse_job_status(response)
+    
+    def _parse_job_status(self, response: Any) -> Dict[str, Any]:
+        """Map an H3Africa job response to our internal status."""
+        job_data = response.get('data', {})
+        
+        # Map H3Africa status to our internal status
+        status_mapping = {
+            'submitted': 'queued',
+            'waiting': 'queued',
+            'running': 'running',
+            'success': 'completed',
+            'error': 'failed',
+            'cancelled': 'cancelled',
+        }
+        
+        return {
+            'status': status_mapping.get(job_data.get('state'), 'pending'),
+            'progress': job_data.get('progress', 0),
+            'message': job_data.get('message', ''),
+            'external_data': job_data
+        }
     
     def download_results(self, external_job_id: str) -> List[Dict[str, Any]]:
         """Get download URLs for H3Africa job results."""
         try:
-            response = self._make_request('GET', f'jobs/{external_job_id}/results')
-            files = []
-            
-            for file_data in response.get('files', []):
-                files.append({
-                    'filename': file_data.get('name'),
-                    'file_type': self._map_file_type(file_data.get('type')),
-                    'download_url': file_data.get('download_url'),
-                    'file_size': file_data.get('size'),
-                    'checksum': file_data.get('checksum'),
-                })
-            
-            return files
+            response = self._make_request(
+                'GET', self.results_endpoint.format(external_job_id=external_job_id)
+            )
+            return self._parse_results(response)
         except Exception as e:
             logger.error(f"Failed to get H3Africa results: {e}")
             return []
     
+    def _parse_results(self, response: Any) -> List[Dict[str, Any]]:
+        """Convert the H3Africa results response."""
+        files = []
+        
+        for file_data in response.get('files', []):
+            files.append({
+                'filename': file_data.get('name'),
+                'file_type': self._map_file_type(file_data.get('type')),
+                'download_url': file_data.get('download_url'),
+                'file_size': file_data.get('size'),
+                'checksum': file_data.get('checksum'),
+            })
+        
+        return files
+    
     def cancel_job(self, external_job_id: str) -> bool:
         """Cancel a H3Africa job."""
         try:
@@ -184,34 +327,39 @@ class H3AfricaImputationService(BaseImputationService):
 class MichiganImputationService(BaseImputationService):
     """Michigan Imputation Service integration."""
     
+    reference_panels_endpoint = 'refpanels'
+    
     def get_reference_panels(self) -> List[Dict[str, Any]]:
         """Get available reference panels from Michigan."""
         try:
-            response = self._make_request('GET', 'refpanels')
-            panels = []
-            
-            for panel_data in response:
-                panels.append({
-                    'panel_id': panel_data.get('id'),
-                    'name': panel_data.get('name'),
-                    'description': panel_data.get('description', ''),
-                    'population': panel_data.get('population', ''),
-                    'build': panel_data.get('build', 'hg38'),
-                    'samples_count': panel_data.get('samples', 0),
-                    'variants_count': panel_data.get('variants', 0),
-                })
-            
-            return panels
+            return self.fetch_reference_panels()
         except Exception as e:
             logger.error(f"Failed to fetch Michigan reference panels: {e}")
             return []
     
-    def submit_job(self, job: ImputationJob, file_data: bytes) -> str:
+    def _parse_reference_panels(self, response: Any) -> List[Dict[str, Any]]:
+        """Convert the Michigan refpanels response."""
+        panels = []
+        
+        for panel_data in response:
+            panels.append({
+                'panel_id': panel_data.get('id'),
+                'name': panel_data.get('name'),
+                'description': panel_data.get('description', ''),
+                'population': panel_data.get('population', ''),
+                'build': panel_data.get('build', 'hg38'),
+                'samples_count': panel_data.get('samples', 0),
+                'variants_count': panel_data.get('variants', 0),
+            })
+        
+        return panels
+    
+    def submit_job(self, job: ImputationJob, input_file: BinaryIO) -> str:
         """Submit an imputation job to Michigan."""
-        # Step 1: Upload file
-        files = {'file': ('data.vcf.gz', file_data, 'application/gzip')}
-        upload_response = self._make_request('POST', 'files', files=files)
-        file_id = upload_response.get('id')
+        # Step 1: Upload file (or reuse the one from a previous attempt)
+        previous_file_id = job.remote_file_id
+        file_id = self._upload_input_file(job, input_file)
+        reused_file = bool(previous_file_id) and file_id == previous_file_id
         
         # Step 2: Submit job
         payload = {
@@ -227,54 +375,197 @@ class MichiganImputationService(BaseImputationService):
         try:
             response = self._make_request('POST', 'jobs/submit', json=payload)
             return response.get('id')
+        except requests.exceptions.HTTPError as e:
+            if not reused_file or e.response is None or e.response.status_code not in (400, 404, 410):
+                logger.error(f"Failed to submit job to Michigan: {e}")
+                raise
+            # The service no longer knows the reused file; upload it again once
+            logger.warning(f"Remote file {file_id} rejected for job {job.id}, uploading again: {e}")
+            self._save_job_fields(job, remote_file_id='')
+            payload['files'] = [self._upload_input_file(job, input_file)]
+            response = self._make_request('POST', 'jobs/submit', json=payload)
+            return response.get('id')
         except Exception as e:
             logger.error(f"Failed to submit job to Michigan: {e}")
             raise
     
+    def _upload_input_file(self, job: ImputationJob, input_file: BinaryIO) -> str:
+        """Upload the input file and return the remote file ID.
+        
+        If the job already holds a remote file ID for input with the same
+        SHA-256, the upload is skipped and that ID is reused.
+        """
+        checksum = file_sha256(input_file)
+        if job.remote_file_id and job.input_file_checksum == checksum:
+            logger.info(f"Reusing remote file {job.remote_file_id} for job {job.id}")
+            return job.remote_file_id
+        
+        if job.input_file_checksum != checksum:
+            # Input changed, so any earlier upload session is stale as well
+            self._save_job_fields(job, input_file_checksum=checksum, remote_file_id='', upload_id='', upload_confirmed_bytes=0)
+        
+        file_id = self._upload_chunked(job, input_file) if self._chunked_upload_enabled() else None
+        if file_id is None:
+            upload_response = self._multipart_request(
+                'files', {'file': ('data.vcf.gz', input_file, 'application/gzip')}
+            )
+            file_id = upload_response.get('id')
+        
+        self._save_job_fields(job, remote_file_id=file_id or '')
+        return file_id
+    
+    def _chunked_upload_enabled(self) -> bool:
+        """Check whether the service has opted in to resumable chunked uploads.
+        
+        The resumable protocol is not part of the public Michigan API, so it
+        is only used when ``chunked_upload`` is set in the service's
+        ServiceConfiguration.settings for a deployment known to provide it.
+        """
+        return bool(self.config and self.config.settings.get('chunked_upload'))
+    
+    def _upload_chunk_size(self) -> int:
+        """Chunk size in bytes for resumable uploads."""
+        if self.config and self.config.settings.get('upload_chunk_size_mb'):
+            return int(self.config.settings['upload_chunk_size_mb']) * 1024 * 1024
+        return settings.UPLOAD_CHUNK_SIZE_BYTES
+    
+    def _upload_chunked(self, job: ImputationJob, input_file: BinaryIO) -> Optional[str]:
+        """Upload the input file in chunks, resuming from the last confirmed byte.
+        
+        Expects the service to provide this resumable upload API:
+        
+        - ``POST files/uploads`` with ``{"filename", "size"}`` opens a session
+          and returns ``{"id", "offset"}``;
+        - ``GET files/uploads/<id>`` returns the confirmed ``{"offset"}``;
+        - ``PUT files/uploads/<id>`` appends the chunk given by its
+          ``Content-Range`` and returns the new ``{"offset"}``, plus
+          ``{"file_id"}`` once the last byte is received.
+        
+        The session ID and confirmed offset are checkpointed on the job after
+        every chunk, so a task retry or worker restart continues where the
+        previous attempt stopped. Returns None when the service turns out not
+        to support the API, so the caller can fall back to a single upload.
+        """
+        total_size = os.fstat(input_file.fileno()).st_size
+        chunk_size = self._upload_chunk_size()
+        upload_id = job.upload_id
+        upload_state = {}
+        
+        if upload_id:
+            try:
+                upload_state = self._make_request('GET', f'files/uploads/{upload_id}')
+                logger.info(
+                    f"Resuming upload {upload_id} for job {job.id} "
+                    f"at byte {upload_state.get('offset', 0)} of {total_size}"
+                )
+            except requests.exceptions.HTTPError as e:
+                logger.warning(f"Upload session {upload_id} for job {job.id} is no longer valid: {e}")
+                upload_id = ''
+        
+        if not upload_id:
+            try:
+                upload_state = self._make_request('POST', 'files/uploads', json={
+                    'filename': 'data.vcf.gz',
+                    'size': total_size,
+                })
+            except requests.exceptions.HTTPError as e:
+                if e.response is None or e.response.status_code not in (404, 405, 501):
+                    raise
+                logger.warning(f"{self.service.name} does not support chunked uploads, uploading in one request")
+                return None
+            upload_id = upload_state['id']
+        
+        offset = upload_state.get('offset', 0)
+        self._save_upload_checkpoint(job, upload_id, offset)
+        
+        while offset < total_size:
+            input_file.seek(offset)
+            chunk = input_file.read(chunk_size)
+            end = offset + len(chunk) - 1
+            upload_state = self._make_request(
+                'PUT', f'files/uploads/{upload_id}',
+                data=chunk,
+                headers={
+                    'Content-Type': 'application/octet-stream',
+                    'Content-Range': f'bytes {offset}-{end}/{total_size}',
+                }
+            )
+            offset = upload_state.get('offset', end + 1)
+            self._save_upload_checkpoint(job, upload_id, offset)
+        
+        file_id = upload_state.get('file_id')
+        if not file_id:
+            raise ValueError(f"Upload {upload_id} finished without a file ID")
+        
+        self._save_upload_checkpoint(job, '', offset)
+        return file_id
+    
+    def _save_upload_checkpoint(self, job: ImputationJob, upload_id: str, offset: int):
+        """Record the upload session and confirmed bytes."""
+        self._save_job_fields(job, upload_id=upload_id, upload_confirmed_bytes=offset)
+    
+    def _save_job_fields(self, job: ImputationJob, **fields):
+        """Persist upload bookkeeping fields without a full job save."""
+        for name, value in fields.items():
+            setattr(job, name, value)
+        ImputationJob.objects.filter(pk=job.pk).update(**fields)
+    
     def get_job_status(self, external_job_id: str) -> Dict[str, Any]:
-        """Get job status from Michigan."""
-        try:
-            response = self._make_request('GET', f'jobs/{external_job_id}')
-            
-            # Map Michigan status to our internal status
-            status_mapping = {
-                'waiting': 'queued',
-                'running': 'running',
-                'success': 'completed',
-                'error': 'failed',
-                'canceled': 'cancelled',
-            }
-            
-            return {
-                'status': status_mapping.get(response.get('state'), 'pending'),
-                'progress': response.get('progress', 0),
-                'message': response.get('message', ''),
-                'external_data': response
-            }
-        except Exception as e:
-            logger.error(f"Failed to get Michigan job status: {e}")
-            return {'status': 'failed', 'progress': 0, 'message': str(e)}
+        """Get job status from Michigan.
+        
+        Transport, timeout and server errors are raised rather than reported
+        as a failed job, so callers leave the job untouched until the next poll.
+        """
+        response = self._make_request(
+            'GET', self.job_status_endpoint.format(external_job_id=external_job_id),
+            timeout=status_timeout(self.service)
+        )
+        return self._parse_job_status(response)
+    
+    def _parse_job_status(self, response: Any) -> Dict[str, Any]:
+        """Map a Michigan job response to our internal status."""
+        # Map Michigan status to our internal status
+        status_mapping = {
+            'waiting': 'queued',
+            'running': 'running',
+            'success': 'completed',
+            'error': 'failed',
+            'canceled': 'cancelled',
+        }
+        
+        return {
+            'status': status_mapping.get(response.get('state'), 'pending'),
+            'progress': response.get('progress', 0),
+            'message': response.get('message', ''),
+            'external_data': response
+        }
     
     def download_results(self, external_job_id: str) -> List[Dict[str, Any]]:
         """Get download URLs for Michigan job results."""
         try:
-            response = self._make_request('GET', f'jobs/{external_job_id}/results')
-            files = []
-            
-            for file_data in response:
-                files.append({
-                    'filename': file_data.get('name'),
-                    'file_type': self._map_file_type(file_data.get('name')),
-                    'download_url': file_data.get('url'),
-                    'file_size': file_data.get('size'),
-                    'checksum': file_data.get('hash'),
-                })
-            
-            return files
+            response = self._make_request(
+                'GET', self.results_endpoint.format(external_job_id=external_job_id)
+            )
+            return self._parse_results(response)
         except Exception as e:
             logger.error(f"Failed to get Michigan results: {e}")
             return []
     
+    def _parse_results(self, response: Any) -> List[Dict[str, Any]]:
+        """Convert the Michigan results response."""
+        files = []
+        
+        for file_data in response:
+            files.append({
+                'filename': file_data.get('name'),
+                'file_type': self._map_file_type(file_data.get('name')),
+                'download_url': file_data.get('url'),
+                'file_size': file_data.get('size'),
+                'checksum': file_data.get('hash'),
+            })
+        
+        return files
+    
     def cancel_job(self, external_job_id: str) -> bool:
         """Cancel a Michigan job."""
         try:
@@ -316,43 +607,106 @@ class ImputationServiceFactory:
         return service_class(service)
 
 
+def file_sha256(input_file: BinaryIO, block_size: int = 1024 * 1024) -> str:
+    """Hash an open file in fixed-size blocks and rewind it."""
+    digest = hashlib.sha256()
+    input_file.seek(0)
+    for block in iter(lambda: input_file.read(block_size), b''):
+        digest.update(block)
+    input_file.seek(0)
+    return digest.hexdigest()
+
+
 def get_service_instance(service_id: int) -> BaseImputationService:
     """Get a service instance by ID."""
     try:
-        service = ImputationService.objects.get(id=service_id, is_active=True)
+        service = ImputationService.objects.select_related('configuration').get(id=service_id, is_active=True)
         return ImputationServiceFactory.create_service(service)
     except ImputationService.DoesNotExist:
         raise ValueError(f"Service with ID {service_id} not found or inactive")
 
 
+# Panel attributes taken from a service's catalog on sync
+PANEL_SYNC_FIELDS = ['name', 'description', 'population', 'build', 'samples_count', 'variants_count', 'is_active']
+
+
+def apply_panel_sync(service: ImputationService, panels: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Reconcile a service's reference panels with its remote catalog.
+    
+    The diff against existing rows is applied with one bulk insert, one bulk
+    update and one deactivation in a single transaction. Panels missing from
+    the catalog are deactivated rather than deleted, so jobs that reference
+    them keep their foreign keys.
+    """
+    incoming = {}
+    for panel_data in panels:
+        panel_id = panel_data.get('panel_id')
+        if not panel_id:
+            logger.warning(f"Skipping reference panel without an ID from {service.name}: {panel_data.get('name')}")
+            continue
+        incoming[str(panel_id)] = {
+            'name': panel_data.get('name') or str(panel_id),
+            'description': panel_data.get('description') or '',
+            'population': panel_data.get('population') or '',
+            'build': panel_data.get('build') or '',
+            'samples_count': panel_data.get('samples_count'),
+            'variants_count': panel_data.get('variants_count'),
+            'is_active': panel_data.get('is_active', True),
+        }
+    
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    
+    with transaction.atomic():
+        # Serialize concurrent syncs of the same service
+        ImputationService.objects.select_for_update().filter(pk=service.pk).exists()
+        existing = {panel.panel_id: panel for panel in ReferencePanel.objects.filter(service=service)}
+        
+        for panel_id, values in incoming.items():
+            panel = existing.get(panel_id)
+            if panel is None:
+                to_create.append(ReferencePanel(service=service, panel_id=panel_id, **values))
+            elif any(getattr(panel, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(panel, field, value)
+                panel.updated_at = now  # bulk_update skips auto_now
+                to_update.append(panel)
+        
+        stale_ids = [
+            panel.pk for panel_id, panel in existing.items()
+            if panel_id not in incoming and panel.is_active
+        ]
+        
+        ReferencePanel.objects.bulk_create(to_create, batch_size=500)
+        ReferencePanel.objects.bulk_update(to_update, PANEL_SYNC_FIELDS + ['updated_at'], batch_size=500)
+        ReferencePanel.objects.filter(pk__in=stale_ids).update(is_active=False, updated_at=now)
+        
+        # Bulk writes send no model signals, so invalidate the catalog here
+        if to_create or to_update or stale_ids:
+            transaction.on_commit(invalidate_catalog)
+    
+    result = {
+        'created': len(to_create),
+        'updated': len(to_update),
+        'deactivated': len(stale_ids),
+        'unchanged': len(incoming) - len(to_create) - len(to_update),
+    }
+    logger.info(f"Synced reference panels for {service.name}: {result}")
+    return result
+
+
 def sync_reference_panels(service_id: int) -> int:
     """Sync reference panels from external service."""
-    service = ImputationService.objects.get(id=service_id, is_active=True)
+    service = ImputationService.objects.select_related('configuration').get(id=service_id, is_active=True)
     service_instance = ImputationServiceFactory.create_service(service)
     
     try:
-        panels_data = service_instance.get_reference_panels()
-        synced_count = 0
-        
-        for panel_data in panels_data:
-            panel, created = ReferencePanel.objects.update_or_create(
-                service=service,
-                panel_id=panel_data['panel_id'],
-                defaults={
-                    'name': panel_data['name'],
-                    'description': panel_data['description'],
-                    'population': panel_data['population'],
-                    'build': panel_data['build'],
-                    'samples_count': panel_data['samples_count'],
-                    'variants_count': panel_data['variants_count'],
-                    'is_active': True,
-                }
-            )
-            synced_count += 1
-        
-        logger.info(f"Synced {synced_count} reference panels for {service.name}")
-        return synced_count
+        # A failed fetch must not look like an empty catalog and deactivate every panel
+        panels_data = service_instance.fetch_reference_panels()
+        apply_panel_sync(service, panels_data)
+        return len(panels_data)
         
     except Exception as e:
         logger.error(f"Failed to sync reference panels for {service.name}: {e}")
-        raise 
\ No newline at end of file
+        raise
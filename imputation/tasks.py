@@ -1,15 +1,86 @@
 """
 Celery tasks for async imputation job processing.
 """
+import os
+import time
+import uuid
 import logging
-from typing import Dict, Any
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
 from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
 from django.utils import timezone
-from .models import ImputationJob, JobStatusUpdate, ResultFile
+from .models import ImputationJob, JobStatusUpdate, ResultFile, UserJobStats
 from .services import get_service_instance, sync_reference_panels
 
 logger = logging.getLogger(__name__)
 
+# Jobs in these states have been handed to an external service and still
+# need their status polled.
+ACTIVE_JOB_STATUSES = ['pending', 'queued', 'running']
+TERMINAL_JOB_STATUSES = ['completed', 'failed', 'cancelled']
+
+# Fields written back by the batched status poller.
+POLLED_JOB_FIELDS = [
+    'status', 'progress_percentage', 'error_message', 'started_at',
+    'completed_at', 'execution_time_seconds', 'service_response', 'updated_at',
+]
+
+POLL_ACTIVE_JOBS_LOCK = 'imputation:poll_active_jobs:lock'
+
+
+def _apply_job_status(job: ImputationJob, status_data: Dict[str, Any]) -> Optional[JobStatusUpdate]:
+    """Apply a service status response to a job in memory.
+    
+    Returns an unsaved JobStatusUpdate when the status, progress or message
+    changed, otherwise None. The caller is responsible for saving both.
+    """
+    old_status = job.status
+    old_progress = job.progress_percentage
+    
+    job.update_status(
+        status_data['status'],
+        progress=status_data['progress'],
+        error_message=status_data.get('message', ''),
+        commit=False
+    )
+    job.service_response = status_data.get('external_data', {})
+    job.updated_at = timezone.now()
+    
+    if (old_status != job.status or
+        old_progress != job.progress_percentage or
+        status_data.get('message')):
+        
+        return JobStatusUpdate(
+            job=job,
+            status=job.status,
+            progress_percentage=job.progress_percentage,
+            message=status_data.get('message', ''),
+            external_data=status_data.get('external_data', {})
+        )
+    return None
+
+
+@contextmanager
+def _open_input_file(job: ImputationJob, file_path: str = None):
+    """Open a job's input file for streaming without reading it into memory."""
+    if file_path:
+        with open(file_path, 'rb') as f:
+            yield f
+    elif job.input_file:
+        job.input_file.open('rb')
+        try:
+            yield job.input_file.file
+        finally:
+            job.input_file.close()
+    else:
+        raise ValueError("No input file provided")
+
 
 @shared_task(bind=True, max_retries=3)
 def submit_imputation_job(self, job_id: str, file_path: str = None):
@@ -18,25 +89,18 @@ def submit_imputation_job(self, job_id: str, file_path: str = None):
         job = ImputationJob.objects.get(id=job_id)
         service_instance = get_service_instance(job.service.id)
         
-        # Read file data
-        if file_path:
-            with open(file_path, 'rb') as f:
-                file_data = f.read()
-        elif job.input_file:
-            file_data = job.input_file.read()
-        else:
-            raise ValueError("No input file provided")
-        
-        # Update job status
-        job.update_status('queued')
-        JobStatusUpdate.objects.create(
-            job=job,
-            status='queued',
-            message='Job queued for submission'
-        )
-        
-        # Submit to external service
-        external_job_id = service_instance.submit_job(job, file_data)
+        # Stream the input file to the service
+        with _open_input_file(job, file_path) as input_file:
+            # Update job status
+            job.update_status('queued')
+            JobStatusUpdate.objects.create(
+                job=job,
+                status='queued',
+                message='Job queued for submission'
+            )
+            
+            # Submit to external service
+            external_job_id = service_instance.submit_job(job, input_file)
         
         # Update job with external ID
         job.external_job_id = external_job_id
@@ -50,8 +114,7 @@ def submit_imputation_job(self, job_id: str, file_path: str = None):
             message=f'Job submitted to {job.service.name} with ID: {external_job_id}'
         )
         
-        # Schedule status monitoring
-        monitor_job_status.apply_async((job_id,), countdown=30)
+        # Status monitoring is picked up by the periodic poll_active_jobs task
         
         logger.info(f"Successfully submitted job {job_id} to {job.service.name}")
         return {'status': 'success', 'external_job_id': external_job_id}
@@ -77,93 +140,151 @@ def submit_imputation_job(self, job_id: str, file_path: str = None):
         return {'status': 'failed', 'error': str(exc)}
 
 
-@shared_task(bind=True, max_retries=10)
-def monitor_job_status(self, job_id: str):
-    """Monitor the status of a submitted job."""
+@shared_task
+def poll_active_jobs():
+    """Poll the status of every active job in batches grouped by service.
+    
+    Runs periodically from celery beat. All active jobs are loaded with a
+    single query, each service is instantiated once, and status changes are
+    written back with one bulk update per batch.
+    """
+    interval = settings.JOB_STATUS_POLL_INTERVAL_SECONDS
+    lock_token = uuid.uuid4().hex
+    if not cache.add(POLL_ACTIVE_JOBS_LOCK, lock_token, timeout=interval * 5):
+        logger.info("Previous job status poll still running, skipping")
+        return {'status': 'skipped'}
+    
     try:
-        job = ImputationJob.objects.get(id=job_id)
+        jobs = ImputationJob.objects.filter(
+            status__in=ACTIVE_JOB_STATUSES
+        ).exclude(external_job_id='').only(
+            'id', 'user_id', 'service_id', 'external_job_id', 'status',
+            'progress_percentage', 'error_message', 'started_at',
+            'completed_at', 'execution_time_seconds', 'service_response',
+        ).order_by('service_id', 'created_at')
+        
+        jobs_by_service = {}
+        for job in jobs:
+            jobs_by_service.setdefault(job.service_id, []).append(job)
+        
+        batch_size = settings.JOB_STATUS_POLL_BATCH_SIZE
+        results = {'polled': 0, 'updated': 0, 'completed': 0, 'services': len(jobs_by_service)}
+        
+        for service_id, service_jobs in jobs_by_service.items():
+            try:
+                service_instance = get_service_instance(service_id)
+            except ValueError as exc:
+                logger.warning(f"Skipping {len(service_jobs)} active jobs: {exc}")
+                continue
+            
+            if service_instance.circuit_breaker.is_open():
+                logger.warning(
+                    f"Circuit open for {service_instance.service.name}, "
+                    f"skipping {len(service_jobs)} active jobs this round"
+                )
+                continue
+            
+            for start in range(0, len(service_jobs), batch_size):
+                batch = service_jobs[start:start + batch_size]
+                batch_results = _poll_job_batch(service_instance, batch)
+                for key, value in batch_results.items():
+                    results[key] += value
+        
+        logger.info(
+            f"Polled {results['polled']} active jobs across {results['services']} services, "
+            f"{results['updated']} updated, {results['completed']} completed"
+        )
+        return results
+    finally:
+        # A run that outlived the lock TTL must not release the next run's lock
+        if cache.get(POLL_ACTIVE_JOBS_LOCK) == lock_token:
+            cache.delete(POLL_ACTIVE_JOBS_LOCK)
+
+
+def _poll_job_batch(service_instance, jobs) -> Dict[str, int]:
+    """Check one batch of jobs against a service and persist the changes."""
+    try:
+        statuses = service_instance.get_jobs_status([job.external_job_id for job in jobs])
+    except Exception as exc:
+        logger.error(f"Failed to poll {len(jobs)} jobs on {service_instance.service.name}: {exc}")
+        return {'polled': 0, 'updated': 0, 'completed': 0}
+    
+    polled_jobs = []
+    status_updates = []
+    completed_jobs = []
+    stats_deltas = {}
+    
+    for job in jobs:
+        status_data = statuses.get(job.external_job_id)
+        if not status_data:
+            continue
+        
+        old_status = job.status
+        update = _apply_job_status(job, status_data)
+        polled_jobs.append(job)
+        if update:
+            status_updates.append(update)
+        if job.status != old_status:
+            # bulk_update bypasses save(), so move the owner's counters here
+            stats_deltas.setdefault(job.user_id, Counter()).update(
+                UserJobStats.transition_deltas(old_status, job.status)
+            )
+        
+        if job.status == 'completed' and old_status != 'completed':
+            completed_jobs.append(job)
+        elif job.status == 'failed' and old_status != 'failed':
+            logger.error(f"Job {job.id} failed: {status_data.get('message', '')}")
+    
+    with transaction.atomic():
+        ImputationJob.objects.bulk_update(polled_jobs, POLLED_JOB_FIELDS)
+        JobStatusUpdate.objects.bulk_create(status_updates)
+        UserJobStats.apply_deltas(stats_deltas)
+    
+    for job in completed_jobs:
+        download_job_results.apply_async((str(job.id),), countdown=10)
+        logger.info(f"Job {job.id} completed, scheduling result download")
+    
+    return {
+        'polled': len(jobs),
+        'updated': len(status_updates),
+        'completed': len(completed_jobs),
+    }
+
+
+@shared_task
+def monitor_job_status(job_id: str):
+    """Check the status of a single job once.
+    
+    Regular monitoring is handled by poll_active_jobs; this task is kept for
+    on-demand checks and does not reschedule itself.
+    """
+    try:
+        job = ImputationJob.objects.select_related('service').get(id=job_id)
         
         if not job.external_job_id:
             logger.error(f"Job {job_id} has no external job ID")
             return {'status': 'error', 'message': 'No external job ID'}
         
-        if job.status in ['completed', 'failed', 'cancelled']:
+        if job.status in TERMINAL_JOB_STATUSES:
             logger.info(f"Job {job_id} already in terminal state: {job.status}")
             return {'status': job.status}
         
         service_instance = get_service_instance(job.service.id)
         status_data = service_instance.get_job_status(job.external_job_id)
         
-        # Update job status
-        old_status = job.status
-        old_progress = job.progress_percentage
-        
-        job.update_status(
-            status_data['status'],
-            progress=status_data['progress'],
-            error_message=status_data.get('message', '')
-        )
-        job.service_response = status_data.get('external_data', {})
+        update = _apply_job_status(job, status_data)
         job.save()
+        if update:
+            update.save()
         
-        # Create status update record if changed
-        if (old_status != job.status or 
-            old_progress != job.progress_percentage or 
-            status_data.get('message')):
-            
-            JobStatusUpdate.objects.create(
-                job=job,
-                status=job.status,
-                progress_percentage=job.progress_percentage,
-                message=status_data.get('message', ''),
-                external_data=status_data.get('external_data', {})
-            )
-        
-        # If job completed, download results
         if job.status == 'completed':
             download_job_results.apply_async((job_id,), countdown=10)
             logger.info(f"Job {job_id} completed, scheduling result download")
-            return {'status': 'completed'}
-        
-        # If job failed, log and stop monitoring
-        elif job.status == 'failed':
-            logger.error(f"Job {job_id} failed: {status_data.get('message', '')}")
-            return {'status': 'failed'}
-        
-        # If job cancelled, stop monitoring
-        elif job.status == 'cancelled':
-            logger.info(f"Job {job_id} was cancelled")
-            return {'status': 'cancelled'}
         
-        # Continue monitoring for running/queued jobs
-        else:
-            # Schedule next status check with exponential backoff
-            next_check = min(300, 30 + (self.request.retries * 30))  # Max 5 minutes
-            monitor_job_status.apply_async((job_id,), countdown=next_check)
-            
-            logger.info(f"Job {job_id} status: {job.status} ({job.progress_percentage}%)")
-            return {'status': job.status, 'progress': job.progress_percentage}
+        return {'status': job.status, 'progress': job.progress_percentage}
         
     except Exception as exc:
         logger.error(f"Failed to monitor job {job_id}: {exc}")
-        
-        # Retry with exponential backoff
-        if self.request.retries < self.max_retries:
-            countdown = min(3600, 60 * (2 ** self.request.retries))  # Max 1 hour
-            raise self.retry(exc=exc, countdown=countdown)
-        
-        # Max retries reached, mark job as failed
-        try:
-            job = ImputationJob.objects.get(id=job_id)
-            job.update_status('failed', error_message=f'Monitoring failed: {exc}')
-            JobStatusUpdate.objects.create(
-                job=job,
-                status='failed',
-                message=f'Status monitoring failed after {self.max_retries} retries: {exc}'
-            )
-        except ImputationJob.DoesNotExist:
-            pass
-        
         return {'status': 'failed', 'error': str(exc)}
 
 
@@ -200,6 +321,9 @@ def download_job_results(self, job_id: str):
             )
             created_files.append(result_file)
         
+        # Fetch the files into local storage before the remote links expire
+        fetch_errors = _fetch_result_files(service_instance, job, created_files)
+        
         # Update job result files list
         job.result_files = [
             {
@@ -213,6 +337,12 @@ def download_job_results(self, job_id: str):
         ]
         job.save()
         
+        if fetch_errors:
+            raise RuntimeError(
+                f"{len(fetch_errors)} of {len(created_files)} result files could not be fetched: "
+                + '; '.join(fetch_errors)
+            )
+        
         JobStatusUpdate.objects.create(
             job=job,
             status='completed',
@@ -243,6 +373,53 @@ def download_job_results(self, job_id: str):
         return {'status': 'failed', 'error': str(exc)}
 
 
+def _fetch_result_files(service_instance, job: ImputationJob, result_files) -> list:
+    """Download result files in parallel and record their local paths.
+    
+    Files that are already stored locally with the expected size are
+    skipped, so a retried download only fetches what is missing. Returns a
+    list of error messages for the files that failed.
+    """
+    job_dir = os.path.join(settings.RESULT_FILES_ROOT, str(job.id))
+    pending = []
+    for result_file in result_files:
+        if not result_file.download_url:
+            continue
+        if (result_file.file_path and os.path.exists(result_file.file_path) and
+                os.path.getsize(result_file.file_path) == result_file.file_size):
+            continue
+        pending.append(result_file)
+    
+    if not pending:
+        return []
+    
+    def fetch(result_file):
+        destination = os.path.join(job_dir, os.path.basename(result_file.filename))
+        return service_instance.fetch_result_file(
+            result_file.download_url, destination, result_file.checksum
+        )
+    
+    errors = []
+    fetched = []
+    max_workers = min(len(pending), settings.RESULT_DOWNLOAD_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(result_file, executor.submit(fetch, result_file)) for result_file in pending]
+        for result_file, future in futures:
+            try:
+                local_file = future.result()
+            except Exception as exc:
+                logger.error(f"Failed to fetch {result_file.filename} for job {job.id}: {exc}")
+                errors.append(f"{result_file.filename}: {exc}")
+                continue
+            result_file.file_path = local_file['file_path']
+            result_file.file_size = local_file['file_size']
+            result_file.checksum = local_file['checksum']
+            fetched.append(result_file)
+    
+    ResultFile.objects.bulk_update(fetched, ['file_path', 'file_size', 'checksum'])
+    return errors
+
+
 @shared_task
 def cancel_imputation_job(job_id: str):
     """Cancel a submitted job."""
@@ -298,6 +475,56 @@ def sync_service_reference_panels(service_id: int):
         return {'status': 'failed', 'error': str(exc)}
 
 
+@shared_task(soft_time_limit=settings.PANEL_SYNC_SERVICE_TIME_LIMIT_SECONDS)
+def sync_service_panels(run_id: str, service_id: int):
+    """Sync one service's reference panels as part of a panel sync run."""
+    from celery.exceptions import SoftTimeLimitExceeded
+    from .panel_sync import update_service_progress
+    from .services import apply_panel_sync
+    
+    update_service_progress(run_id, service_id, status='running', started_at=timezone.now().isoformat())
+    try:
+        # fetch_reference_panels raises on failure, so a failed fetch never
+        # reaches apply_panel_sync and deactivates the service's panels
+        service_instance = get_service_instance(service_id)
+        panels = service_instance.fetch_reference_panels()
+        update_service_progress(run_id, service_id, status='running', panels=len(panels))
+        
+        # Each service commits on its own, independent of the rest of the run
+        result = apply_panel_sync(service_instance.service, panels)
+        update_service_progress(
+            run_id, service_id, status='success', finished_at=timezone.now().isoformat(), **result
+        )
+        return {'status': 'success', **result}
+        
+    except SoftTimeLimitExceeded:
+        error = f'Timed out after {settings.PANEL_SYNC_SERVICE_TIME_LIMIT_SECONDS}s'
+    except Exception as exc:
+        error = str(exc)
+    
+    logger.error(f"Panel sync run {run_id} failed for service {service_id}: {error}")
+    update_service_progress(run_id, service_id, status='failed', error=error, finished_at=timezone.now().isoformat())
+    return {'status': 'failed', 'error': error}
+
+
+@shared_task
+def refresh_service_info(service_id: int):
+    """Fetch and cache GA4GH service-info for a service."""
+    from .models import ImputationService
+    from . import service_info
+    
+    try:
+        service = ImputationService.objects.select_related('configuration').get(id=service_id)
+        service_info.refresh(service)
+        logger.info(f"Refreshed service info for {service.name}")
+        return {'status': 'success'}
+        
+    except Exception as exc:
+        # refresh() has released the lock, so the next read retries
+        logger.error(f"Failed to refresh service info for service {service_id}: {exc}")
+        return {'status': 'failed', 'error': str(exc)}
+
+
 @shared_task
 def cleanup_old_jobs():
     """Clean up old completed/failed jobs and their files."""
@@ -325,26 +552,98 @@ def cleanup_old_jobs():
 
 
 @shared_task
-def health_check_services():
-    """Check the health of all active imputation services."""
-    from .models import ImputationService
+def reconcile_user_job_stats():
+    """Recount jobs per user and status and correct any counter drift.
     
-    results = {}
+    The counter rows are locked before the jobs are counted, so transitions
+    that commit meanwhile wait for the correction instead of being overwritten.
+    """
+    fields = ['total'] + UserJobStats.STATUS_FIELDS
+    zero = dict.fromkeys(fields, 0)
+    to_update = []
     
-    for service in ImputationService.objects.filter(is_active=True):
-        try:
-            service_instance = get_service_instance(service.id)
-            # Try to fetch reference panels as a health check
-            panels = service_instance.get_reference_panels()
-            results[service.name] = {
-                'status': 'healthy',
-                'panels_count': len(panels)
-            }
-        except Exception as exc:
-            results[service.name] = {
-                'status': 'unhealthy',
-                'error': str(exc)
-            }
-            logger.error(f"Health check failed for {service.name}: {exc}")
+    with transaction.atomic():
+        existing = UserJobStats.objects.select_for_update().in_bulk()
+        
+        expected = {}
+        rows = ImputationJob.objects.values_list('user_id', 'status').annotate(count=Count('id')).order_by()
+        for user_id, job_status, count in rows:
+            counters = expected.setdefault(user_id, dict(zero))
+            counters['total'] += count
+            if job_status in counters:
+                counters[job_status] = count
+        
+        for user_id, stats in existing.items():
+            counters = expected.pop(user_id, zero)
+            if any(getattr(stats, field) != counters[field] for field in fields):
+                for field in fields:
+                    setattr(stats, field, counters[field])
+                stats.updated_at = timezone.now()
+                to_update.append(stats)
+        
+        UserJobStats.objects.bulk_update(to_update, fields + ['updated_at'], batch_size=1000)
+        UserJobStats.objects.bulk_create(
+            [UserJobStats(user_id=user_id, **counters) for user_id, counters in expected.items()],
+            batch_size=1000,
+            ignore_conflicts=True,  # Rows created by a concurrent first job already count it
+        )
+    
+    if to_update:
+        logger.warning(f"Corrected job counters for {len(to_update)} users")
+    return {'corrected': len(to_update), 'created': len(expected)}
+
+
+@shared_task
+def rollup_job_metrics():
+    """Refresh hourly and daily job metrics rollups for recent buckets."""
+    from .rollups import rollup_job_metrics as run_rollup
+    
+    return run_rollup(settings.JOB_METRICS_ROLLUP_LOOKBACK_HOURS)
+
+
+@shared_task
+def probe_services_health():
+    """Probe every active service concurrently and record a ServiceHealthCheck for each.
+    
+    The latest row per service is what the health endpoints serve. A service
+    that does not answer within the deadline is recorded as unhealthy.
+    """
+    from datetime import timedelta
+    from .models import ImputationService, ServiceHealthCheck
+    from .health import PROBE_LOCK_KEY, health_check_from_snapshot, probe_service
+    
+    services = list(ImputationService.objects.filter(is_active=True))
+    deadline = settings.SERVICE_HEALTH_CHECK_DEADLINE_SECONDS
+    checks = []
+    
+    try:
+        if services:
+            max_workers = min(settings.SERVICE_HEALTH_PROBE_MAX_WORKERS, len(services))
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            futures = {executor.submit(probe_service, service): service for service in services}
+            # Probes beyond max_workers queue up, so allow one deadline per round
+            rounds = -(-len(services) // max_workers)
+            done, _ = wait(futures, timeout=deadline * rounds)
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+            for future, service in futures.items():
+                if future in done:
+                    checks.append(health_check_from_snapshot(service, future.result()))
+                else:
+                    logger.error(f"Health probe for {service.name} exceeded its {deadline}s deadline")
+                    checks.append(ServiceHealthCheck(
+                        service=service,
+                        is_healthy=False,
+                        error_class='DeadlineExceeded',
+                        error_message=f'No response within {deadline}s'
+                    ))
+        
+        ServiceHealthCheck.objects.bulk_create(checks)
+    finally:
+        cache.delete(PROBE_LOCK_KEY)
+    
+    # Prune history past the retention window
+    cutoff = timezone.now() - timedelta(days=settings.SERVICE_HEALTH_HISTORY_RETENTION_DAYS)
+    ServiceHealthCheck.objects.filter(checked_at__lt=cutoff).delete()
     
-    return results 
\ No newline at end of file
+    return {check.service.name: 'healthy' if check.is_healthy else 'unhealthy' for check in checks}
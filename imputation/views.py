@@ -1,6 +1,7 @@
 """
 Views for the federated imputation system.
 """
+import os
 import logging
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
@@ -8,29 +9,38 @@ from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.views import APIView
 from rest_framework.authentication import SessionAuthentication
+from django.conf import settings
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.http import HttpResponse, Http404
-from django.db.models import Q
+from django.db.models import Count, Prefetch, Q
 from django.views.generic import TemplateView
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
+from django.utils.crypto import constant_time_compare
 from .models import (
     ImputationService, ReferencePanel, ImputationJob,
-    JobStatusUpdate, ResultFile, UserServiceAccess
+    JobStatusUpdate, ResultFile, UserServiceAccess, UserJobStats,
+    JobMetricsRollup
 )
 from .serializers import (
     ImputationServiceSerializer, ReferencePanelSerializer,
     ImputationJobListSerializer, ImputationJobDetailSerializer,
     ImputationJobCreateSerializer, JobStatusUpdateSerializer,
     ResultFileSerializer, UserServiceAccessSerializer,
-    ServiceSyncSerializer, JobActionSerializer
-)
-from .tasks import (
-    submit_imputation_job, cancel_imputation_job,
-    sync_reference_panels
+    ServiceSyncSerializer, JobActionSerializer, ServiceHealthCheckSerializer,
+    JobMetricsRollupSerializer
 )
+from .catalog import CatalogCacheMixin, catalog_response
+from .downloads import serve_result_file
+from .pagination import KeysetPagination
+from .search import SEARCH_ORDERING, search_jobs
+from .health import get_health_snapshots, schedule_probe
+from .metrics import render_metrics
+from .panel_sync import get_panel_sync_status, start_panel_sync
+from .tasks import submit_imputation_job, cancel_imputation_job
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +54,7 @@ class CsrfExemptSessionAuthentication(SessionAuthentication):
         return  # Skip CSRF check
 
 
-class ImputationServiceViewSet(viewsets.ReadOnlyModelViewSet):
+class ImputationServiceViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for ImputationService operations."""
     
     authentication_classes = [CsrfExemptSessionAuthentication]
@@ -52,26 +62,58 @@ class ImputationServiceViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.AllowAny]
     
     def get_queryset(self):
-        """Get active imputation services."""
-        return ImputationService.objects.filter(is_active=True)
+        """Get active imputation services with their active panel counts."""
+        return ImputationService.objects.filter(is_active=True).annotate(
+            active_panels_count=Count('reference_panels', filter=Q(reference_panels__is_active=True))
+        )
     
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAdminUser])
     def sync_reference_panels(self, request, pk=None):
         """Sync reference panels from external service."""
         service = self.get_object()
         serializer = ServiceSyncSerializer(data={'service_id': service.id})
         
         if serializer.is_valid():
-            # Trigger async task
-            task = sync_reference_panels.delay(service.id)
+            run_id = start_panel_sync([service.id], requested_by=request.user.username)
             
             return Response({
                 'message': f'Reference panel sync started for {service.name}',
-                'task_id': task.id
+                'task_id': run_id,
+                'status_url': self._sync_status_url(request, run_id)
             }, status=status.HTTP_202_ACCEPTED)
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=False, methods=['post'], permission_classes=[permissions.IsAdminUser])
+    def sync_all_reference_panels(self, request):
+        """Sync reference panels of all active services, or those in ``service_ids``, in parallel."""
+        service_ids = request.data.get('service_ids')
+        if service_ids is not None:
+            if not isinstance(service_ids, list) or not all(isinstance(i, int) for i in service_ids):
+                return Response({'error': 'service_ids must be a list of service IDs'},
+                                status=status.HTTP_400_BAD_REQUEST)
+        
+        run_id = start_panel_sync(service_ids, requested_by=request.user.username)
+        sync_status = get_panel_sync_status(run_id)
+        
+        return Response({
+            'message': f"Reference panel sync started for {len(sync_status['service_ids'])} services",
+            'task_id': run_id,
+            'status_url': self._sync_status_url(request, run_id)
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['get'], url_path=r'sync_status/(?P<run_id>[0-9a-f]{32})',
+            permission_classes=[permissions.IsAdminUser])
+    def sync_status(self, request, run_id=None):
+        """Get per-service progress of a reference panel sync run."""
+        sync_status = get_panel_sync_status(run_id)
+        if sync_status is None:
+            return Response({'error': 'Unknown or expired sync run'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(sync_status)
+    
+    def _sync_status_url(self, request, run_id):
+        return request.build_absolute_uri(reverse('api:imputationservice-sync-status', args=[run_id]))
+    
     @action(detail=True, methods=['get'])
     def reference_panels(self, request, pk=None):
         """Get reference panels for a specific service."""
@@ -93,146 +135,58 @@ class ImputationServiceViewSet(viewsets.ReadOnlyModelViewSet):
     
     @action(detail=True, methods=['get'])
     def health(self, request, pk=None):
-        """Check the health status of a specific service."""
+        """Get the latest health snapshot for a specific service."""
+        service = self.get_object()
+        snapshot = get_health_snapshots([service])[service.id]
+        
+        # ?refresh=1 queues a probe; the response still carries the current snapshot
+        if request.query_params.get('refresh') in ('1', 'true') or snapshot['status'] == 'unknown':
+            snapshot = {**snapshot, 'refresh_scheduled': schedule_probe()}
+        
+        return Response(snapshot, status=status.HTTP_200_OK)
+    
+    @action(detail=True, methods=['get'])
+    def health_history(self, request, pk=None):
+        """Get recorded health checks for a service, newest first."""
+        from datetime import timedelta
+        from django.utils import timezone
+        
         service = self.get_object()
         
         try:
-            import requests
-            from requests.exceptions import RequestException, Timeout, ConnectionError
-            
-            # Determine the appropriate health check URL
-            test_url = service.api_url
-            
-            if service.api_type == 'ga4gh':
-                # GA4GH WES services have a service-info endpoint
-                test_url = f"{service.api_url.rstrip('/')}/service-info"
-            elif service.api_type == 'michigan':
-                # Michigan Imputation Server - use API endpoint for proper API response
-                test_url = f"{service.api_url.rstrip('/')}/api/"
-            elif service.api_type == 'dnastack':
-                # DNAstack services - test root URL  
-                test_url = service.api_url
-            
-            # Perform the actual health check with timeout
-            response = requests.get(
-                test_url,
-                timeout=10,  # 10 second timeout
-                verify=False,  # Skip SSL verification for demo services
-                allow_redirects=True
-            )
-            
-            # Check if the response indicates the service is healthy
-            if response.status_code in [200, 201, 202]:
-                return Response({
-                    'service_id': service.id,
-                    'service_name': service.name,
-                    'status': 'healthy',
-                    'message': f'Service responded with HTTP {response.status_code}',
-                    'test_url': test_url,
-                    'response_time_ms': int(response.elapsed.total_seconds() * 1000)
-                }, status=status.HTTP_200_OK)
-            elif service.api_type == 'michigan' and response.status_code == 401:
-                # For Michigan services, HTTP 401 (Unauthorized) indicates the API is online and functioning
-                return Response({
-                    'service_id': service.id,
-                    'service_name': service.name,
-                    'status': 'healthy',
-                    'message': f'Michigan API responded with HTTP {response.status_code} (API online, authentication required)',
-                    'test_url': test_url,
-                    'response_time_ms': int(response.elapsed.total_seconds() * 1000),
-                    'api_response': 'Unauthorized - API is functioning properly'
-                }, status=status.HTTP_200_OK)
-            else:
-                return Response({
-                    'service_id': service.id,
-                    'service_name': service.name,
-                    'status': 'unhealthy',
-                    'message': f'Service responded with HTTP {response.status_code}',
-                    'test_url': test_url,
-                    'error': f'HTTP_{response.status_code}'
-                }, status=status.HTTP_200_OK)  # Still return 200 but with unhealthy status
-            
-        except Timeout:
-            logger.error(f"Timeout checking {service.name} at {test_url}")
-            return Response({
-                'service_id': service.id,
-                'service_name': service.name,
-                'status': 'unhealthy',
-                'message': 'Service request timed out (10s)',
-                'test_url': test_url,
-                'error': 'Timeout'
-            }, status=status.HTTP_200_OK)
-            
-        except ConnectionError:
-            logger.error(f"Connection error checking {service.name} at {test_url}")
-            return Response({
-                'service_id': service.id,
-                'service_name': service.name,
-                'status': 'unhealthy',
-                'message': 'Unable to connect to service',
-                'test_url': test_url,
-                'error': 'ConnectionError'
-            }, status=status.HTTP_200_OK)
-            
-        except RequestException as exc:
-            logger.error(f"Request error checking {service.name} at {test_url}: {exc}")
-            return Response({
-                'service_id': service.id,
-                'service_name': service.name,
-                'status': 'unhealthy',
-                'message': f'Request failed: {str(exc)}',
-                'test_url': test_url,
-                'error': 'RequestException'
-            }, status=status.HTTP_200_OK)
-            
-        except Exception as exc:
-            logger.error(f"Unexpected error checking {service.name} at {test_url}: {exc}")
-            return Response({
-                'service_id': service.id,
-                'service_name': service.name,
-                'status': 'unhealthy',
-                'message': f'Unexpected error: {str(exc)}',
-                'test_url': test_url,
-                'error': type(exc).__name__
-            }, status=status.HTTP_200_OK)
+            hours = int(request.query_params.get('hours', 24))
+        except ValueError:
+            return Response({'error': 'hours must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        checks = service.health_checks.filter(checked_at__gte=timezone.now() - timedelta(hours=hours))
+        
+        # Filter by outcome if provided
+        healthy = request.query_params.get('is_healthy')
+        if healthy in ('true', 'false'):
+            checks = checks.filter(is_healthy=healthy == 'true')
+        
+        serializer = ServiceHealthCheckSerializer(checks[:500], many=True)
+        return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def health_all(self, request):
-        """Check the health status of all services."""
+        """Get the latest health snapshots for all services."""
         from django.utils import timezone
         
-        results = {}
-        
-        for service in self.get_queryset():
-            try:
-                from .services import get_service_instance
-                service_instance = get_service_instance(service.id)
-                
-                # Try to get service info as a health check
-                service_info = service_instance.get_service_info()
-                
-                results[service.id] = {
-                    'service_name': service.name,
-                    'status': 'healthy',
-                    'message': 'Service is responsive'
-                }
-                
-            except Exception as exc:
-                logger.error(f"Health check failed for {service.name}: {exc}")
-                results[service.id] = {
-                    'service_name': service.name,
-                    'status': 'unhealthy',
-                    'message': str(exc),
-                    'error': type(exc).__name__
-                }
+        snapshots = get_health_snapshots(self.get_queryset())
         
-        return Response({
+        response = {
             'timestamp': timezone.now().isoformat(),
-            'services': results
-        })
+            'services': snapshots
+        }
+        if request.query_params.get('refresh') in ('1', 'true') or any(
+                snapshot['status'] == 'unknown' for snapshot in snapshots.values()):
+            response['refresh_scheduled'] = schedule_probe()
+        
+        return Response(response)
 
 
-class ReferencePanelViewSet(viewsets.ReadOnlyModelViewSet):
+class ReferencePanelViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for ReferencePanel operations."""
     
     authentication_classes = [CsrfExemptSessionAuthentication]
@@ -267,12 +221,31 @@ class ImputationJobViewSet(viewsets.ModelViewSet):
     authentication_classes = [CsrfExemptSessionAuthentication]
     serializer_class = ImputationJobListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    
+    # Large columns the list serializer never reads
+    LIST_DEFERRED_FIELDS = ['service_response', 'result_files', 'user_token', 'service__api_config']
     
     def get_queryset(self):
-        """Get jobs for the current user."""
-        queryset = ImputationJob.objects.filter(user=self.request.user).select_related(
-            'user', 'service', 'reference_panel'
-        ).prefetch_related('status_updates', 'files')
+        """Get jobs for the current user, shaped for the current action."""
+        queryset = ImputationJob.objects.filter(user=self.request.user)
+        
+        if self.action == 'list':
+            queryset = queryset.select_related(
+                'user', 'service', 'reference_panel__service'
+            ).defer(*self.LIST_DEFERRED_FIELDS)
+        elif self.action in ['retrieve', 'update', 'partial_update']:
+            # Only the most recent status updates are inlined in the detail view;
+            # the extra row tells the serializer whether to emit a cursor
+            recent_updates = JobStatusUpdate.objects.order_by(*KeysetPagination.ordering)[
+                :settings.JOB_DETAIL_STATUS_UPDATES_LIMIT + 1
+            ]
+            queryset = queryset.select_related(
+                'user', 'service', 'reference_panel__service'
+            ).prefetch_related(
+                Prefetch('status_updates', queryset=recent_updates, to_attr='recent_status_updates'),
+                'files'
+            )
         
         # Filter by status if provided
         status_filter = self.request.query_params.get('status')
@@ -284,15 +257,20 @@ class ImputationJobViewSet(viewsets.ModelViewSet):
         if service_id:
             queryset = queryset.filter(service_id=service_id)
         
-        # Search by name or description
-        search = self.request.query_params.get('search')
+        # Search by name, description, external job ID or service name
+        search = self.request.query_params.get('search', '').strip()
         if search:
-            queryset = queryset.filter(
-                Q(name__icontains=search) | Q(description__icontains=search)
-            )
+            return search_jobs(queryset, search).order_by(*SEARCH_ORDERING)
         
         return queryset.order_by('-created_at')
     
+    @property
+    def keyset_ordering(self):
+        """Sort key for pagination: best match first when searching."""
+        if self.request.query_params.get('search', '').strip():
+            return SEARCH_ORDERING
+        return ('-created_at', '-id')
+    
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == 'create':
@@ -341,7 +319,8 @@ class ImputationJobViewSet(viewsets.ModelViewSet):
         )
         
         if serializer.is_valid():
-            # Reset job status and resubmit
+            # Reset job status and resubmit; the uploaded input file is kept
+            # so an unchanged input is not sent to the service again
             job.status = 'pending'
             job.progress_percentage = 0
             job.error_message = ''
@@ -360,11 +339,12 @@ class ImputationJobViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def status_updates(self, request, pk=None):
-        """Get status updates for a job."""
+        """Get status updates for a job, newest first, cursor-paginated."""
         job = self.get_object()
-        updates = job.status_updates.all()
-        serializer = JobStatusUpdateSerializer(updates, many=True)
-        return Response(serializer.data)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(job.status_updates.all(), request)
+        serializer = JobStatusUpdateSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def files(self, request, pk=None):
@@ -382,27 +362,16 @@ class ImputationJobViewSet(viewsets.ModelViewSet):
         try:
             result_file = job.files.get(id=file_id, is_available=True)
             
-            if result_file.download_url:
+            if result_file.file_path and os.path.exists(result_file.file_path):
+                # Point the browser at the streaming endpoint for the local copy
+                return Response(local_download_info(request, result_file))
+            elif result_file.download_url:
                 # Redirect to external download URL
                 return Response({
                     'download_url': result_file.download_url,
                     'filename': result_file.filename,
                     'file_size': result_file.file_size
                 })
-            elif result_file.file_path:
-                # Serve local file
-                try:
-                    with open(result_file.file_path, 'rb') as f:
-                        response = HttpResponse(
-                            f.read(),
-                            content_type='application/octet-stream'
-                        )
-                        response['Content-Disposition'] = f'attachment; filename="{result_file.filename}"'
-                        return response
-                except FileNotFoundError:
-                    return Response({
-                        'error': 'File not found on server'
-                    }, status=status.HTTP_404_NOT_FOUND)
             else:
                 return Response({
                     'error': 'No download method available for this file'
@@ -420,6 +389,8 @@ class JobStatusUpdateViewSet(viewsets.ReadOnlyModelViewSet):
     authentication_classes = [CsrfExemptSessionAuthentication]
     serializer_class = JobStatusUpdateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-timestamp', '-id')
     
     def get_queryset(self):
         """Get status updates for jobs owned by the current user."""
@@ -434,6 +405,8 @@ class ResultFileViewSet(viewsets.ReadOnlyModelViewSet):
     authentication_classes = [CsrfExemptSessionAuthentication]
     serializer_class = ResultFileSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', '-id')
     
     def get_queryset(self):
         """Get result files for jobs owned by the current user."""
@@ -447,31 +420,49 @@ class ResultFileViewSet(viewsets.ReadOnlyModelViewSet):
         """Download a result file."""
         result_file = self.get_object()
         
-        if result_file.download_url:
+        if result_file.file_path and os.path.exists(result_file.file_path):
+            # Point the browser at the streaming endpoint for the local copy
+            return Response(local_download_info(request, result_file))
+        elif result_file.download_url:
             # Redirect to external download URL
             return Response({
                 'download_url': result_file.download_url,
                 'filename': result_file.filename,
                 'file_size': result_file.file_size
             })
-        elif result_file.file_path:
-            # Serve local file
-            try:
-                with open(result_file.file_path, 'rb') as f:
-                    response = HttpResponse(
-                        f.read(),
-                        content_type='application/octet-stream'
-                    )
-                    response['Content-Disposition'] = f'attachment; filename="{result_file.filename}"'
-                    return response
-            except FileNotFoundError:
-                return Response({
-                    'error': 'File not found on server'
-                }, status=status.HTTP_404_NOT_FOUND)
         else:
             return Response({
                 'error': 'No download method available for this file'
             }, status=status.HTTP_404_NOT_FOUND)
+    
+    @action(detail=True, methods=['get'])
+    def content(self, request, pk=None):
+        """Stream the locally stored copy of a result file (supports Range requests)."""
+        result_file = self.get_object()
+        
+        if not result_file.file_path:
+            return Response({
+                'error': 'File is not stored on this server'
+            }, status=status.HTTP_404_NOT_FOUND)
+        try:
+            return serve_result_file(request, result_file)
+        except FileNotFoundError:
+            return Response({
+                'error': 'File not found on server'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+
+def local_download_info(request, result_file):
+    """Download JSON for a locally stored file, pointing at the streaming endpoint.
+    
+    The frontend fetches download info with XHR and then opens ``download_url``,
+    so the file body itself must never be returned from the download actions.
+    """
+    return {
+        'download_url': request.build_absolute_uri(reverse('api:resultfile-content', args=[result_file.id])),
+        'filename': result_file.filename,
+        'file_size': result_file.file_size
+    }
 
 
 class UserServiceAccessViewSet(viewsets.ReadOnlyModelViewSet):
@@ -501,14 +492,17 @@ class DashboardViewSet(viewsets.ViewSet):
         
         # Job statistics
         if user:
-            jobs = ImputationJob.objects.filter(user=user)
-            total_jobs = jobs.count()
-            completed_jobs = jobs.filter(status='completed').count()
-            running_jobs = jobs.filter(status__in=['pending', 'queued', 'running']).count()
-            failed_jobs = jobs.filter(status='failed').count()
+            # Counters are maintained on every status change, so this is one PK lookup
+            job_stats = UserJobStats.objects.filter(pk=user.pk).first() or UserJobStats(user=user)
+            total_jobs = job_stats.total
+            completed_jobs = job_stats.completed
+            running_jobs = job_stats.active
+            failed_jobs = job_stats.failed
             
             # Recent jobs
-            recent_jobs = jobs.order_by('-created_at')[:5]
+            recent_jobs = ImputationJob.objects.filter(user=user).select_related(
+                'user', 'service', 'reference_panel__service'
+            ).order_by('-created_at', '-id')[:5]
             recent_jobs_data = ImputationJobListSerializer(recent_jobs, many=True).data
             
             # User services
@@ -539,18 +533,72 @@ class DashboardViewSet(viewsets.ViewSet):
             'recent_jobs': recent_jobs_data
         })
     
+    @action(detail=False, methods=['get'])
+    def throughput(self, request):
+        """Get job throughput, duration and success rate over time from the rollups.
+        
+        ``period`` is ``hour`` (default) or ``day`` and ``points`` the number of
+        buckets to return. Rows cover whole services unless ``reference_panel``
+        is given; ``service`` narrows the result to one service.
+        """
+        from datetime import timedelta
+        from django.utils import timezone
+        from .rollups import bucket_floor
+        
+        period = request.query_params.get('period', 'hour')
+        if period not in ('hour', 'day'):
+            return Response({'error': 'period must be hour or day'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if period == 'hour':
+            default_points, max_points, step = 48, settings.JOB_METRICS_MAX_HOURLY_POINTS, timedelta(hours=1)
+        else:
+            default_points, max_points, step = 30, settings.JOB_METRICS_MAX_DAILY_POINTS, timedelta(days=1)
+        try:
+            points = int(request.query_params.get('points', default_points))
+        except ValueError:
+            return Response({'error': 'points must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        points = max(1, min(points, max_points))
+        
+        since = bucket_floor(timezone.now(), period) - step * (points - 1)
+        rollups = JobMetricsRollup.objects.filter(period=period, bucket_start__gte=since)
+        
+        service_id = request.query_params.get('service')
+        panel_id = request.query_params.get('reference_panel')
+        try:
+            if service_id:
+                rollups = rollups.filter(service_id=int(service_id))
+            if panel_id:
+                rollups = rollups.filter(reference_panel_id=int(panel_id))
+            else:
+                rollups = rollups.filter(reference_panel__isnull=True)
+        except ValueError:
+            return Response({'error': 'service and reference_panel must be ids'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = JobMetricsRollupSerializer(rollups.order_by('service_id', 'bucket_start'), many=True)
+        return Response({
+            'period': period,
+            'since': since.isoformat(),
+            'results': serializer.data
+        })
+    
     @action(detail=False, methods=['get'])
     def services_overview(self, request):
         """Get overview of all active services with their capabilities."""
-        services = ImputationService.objects.filter(is_active=True)
-        services_data = []
+        return catalog_response(request, 'services_overview', self._build_services_overview)
+    
+    def _build_services_overview(self):
+        # One query for all active panels instead of two per service
+        panels = {}
+        for service_id, population, build in ReferencePanel.objects.filter(
+            is_active=True, service__is_active=True
+        ).values_list('service_id', 'population', 'build').order_by('service_id', 'id'):
+            populations, builds = panels.setdefault(service_id, ({}, {}))
+            populations[population] = None
+            builds[build] = None
         
-        for service in services:
-            active_panels = ReferencePanel.objects.filter(
-                service=service, 
-                is_active=True
-            )
-            
+        services_data = []
+        for service in ImputationService.objects.filter(is_active=True):
+            populations, builds = panels.get(service.id, ({}, {}))
             services_data.append({
                 'id': service.id,
                 'name': service.name,
@@ -559,15 +607,11 @@ class DashboardViewSet(viewsets.ViewSet):
                 'api_url': service.api_url,
                 'supported_formats': service.supported_formats,
                 'max_file_size_mb': service.max_file_size_mb,
-                'populations': list(
-                    active_panels.values_list('population', flat=True).distinct()
-                ),
-                'builds': list(
-                    active_panels.values_list('build', flat=True).distinct()
-                )
+                'populations': list(populations),
+                'builds': list(builds)
             })
         
-        return Response(services_data)
+        return services_data
 
 
 class IndexView(TemplateView):
@@ -611,6 +655,7 @@ class LoginView(APIView):
                     'email': user.email,
                     'first_name': user.first_name,
                     'last_name': user.last_name,
+                    'is_staff': user.is_staff,
                 },
                 'message': 'Login successful'
             })
@@ -645,5 +690,18 @@ class UserInfoView(APIView):
                 'email': user.email,
                 'first_name': user.first_name,
                 'last_name': user.last_name,
+                'is_staff': user.is_staff,
             }
-        }) 
\ No newline at end of file
+        }) 
+
+
+def metrics(request):
+    """Prometheus exposition, only served to scrapers presenting METRICS_AUTH_TOKEN."""
+    token = settings.METRICS_AUTH_TOKEN
+    if not token:
+        return HttpResponse('Metrics are disabled until METRICS_AUTH_TOKEN is set', status=403)
+    if not constant_time_compare(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}'):
+        return HttpResponse('Unauthorized', status=401)
+    
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)